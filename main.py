@@ -5,12 +5,14 @@ import os
 # Ensure import paths are handled correctly if running directly
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from ui.main_window import MainWindow
-
 def main():
     ctk.set_appearance_mode("Dark")
     ctk.set_default_color_theme("blue")
 
+    # Imported after the appearance setup so first paint isn't blocked on
+    # pulling in the UI modules and their network/config dependencies
+    from ui.main_window import MainWindow
+
     root = ctk.CTk()
     root.configure(fg_color="#1e1e2e")
     app = MainWindow(root)
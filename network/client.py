@@ -2,22 +2,89 @@ import requests
 import os
 import urllib.parse
 import json
-import gzip
-import concurrent.futures
+import itertools
+import logging
+import asyncio
+import collections
+import math
+import queue
+import socket
 import threading
+import functools
 from pathlib import Path
 import time
 from typing import Tuple, List, Optional, Callable
 import hashlib
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    # Fallback to thread-based parallel downloads if aiohttp not available
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    # Fallback to parsing the full listing in one pass if ijson not available
+    IJSON_AVAILABLE = False
+
+# TCP slow-start model parameters for sizing transfers
+MSS = 1460
+INITIAL_CWND = 10 * MSS
+SLOW_START_THRESHOLD = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_path(path: str) -> str:
+    """URL-quote a file path, cached — retries and parallel batches repeat
+    the same paths, and quote() rebuilds its safe-char cache per call."""
+    return urllib.parse.quote(path)
+
+# Extensions where transport gzip wastes CPU on both ends for ~zero savings
+INCOMPRESSIBLE_EXTENSIONS = {
+    '.zip', '.gz', '.xz', '.zst', '.7z', '.rar',
+    '.mp4', '.mkv', '.avi', '.mov',
+    '.mp3', '.aac', '.ogg', '.flac',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+}
+
+
+class _ListingNotModified(Exception):
+    """Internal: the server answered 304 for a conditional listing fetch."""
+
+
+class LANShareHTTPAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter applying LAN-friendly socket options to pooled sockets."""
+
+    # 4MB buffers: default receive buffers (~208KB on Linux) cap a single
+    # flow at RCVBUF/RTT, well below LAN wire speed once RTT rises
+    SOCKET_BUFFER_SIZE = 4 * 1024 * 1024
+
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = list(self.SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
 
 class HTTPClient:
     def __init__(self, max_connections=10):
         self.session = requests.Session()
-        # Optimize session for performance
-        adapter = requests.adapters.HTTPAdapter(
+        # Optimize session for performance: oversized non-blocking pool so
+        # parallel downloads reuse warm keep-alive sockets
+        adapter = LANShareHTTPAdapter(
             pool_connections=max_connections,
-            pool_maxsize=max_connections,
+            pool_maxsize=max_connections * 2,
+            pool_block=False,
             max_retries=3
         )
         self.session.mount('http://', adapter)
@@ -30,45 +97,263 @@ class HTTPClient:
             'User-Agent': 'LANShare/2.0 (Optimized)'
         })
         
-        # Connection cache for similar speed optimization
-        self._connection_cache = {}
+        # Connection cache for similar speed optimization (LRU-bounded so a
+        # long-running session scanning many hosts cannot grow it forever)
+        self._connection_cache = collections.OrderedDict()
+        self._cache_capacity = 256
         self._cache_lock = threading.Lock()
+
+        # Per-file failures queued here and flushed in one batch, keeping
+        # the hot completion loop off the stdout lock
+        self._error_log = collections.deque(maxlen=1000)
+
+        # EWMA bandwidth estimate (bytes/sec) shared across downloads
+        self._bw_ewma = None
+        self._bw_alpha = 0.9
+
+        # ETag of the most recent listing response, recorded by iter_files
+        # for the on-disk listing cache
+        self._last_list_etag = None
+
+        # Long-lived executor for parallel downloads (lazy-created). Sized
+        # once at an upper bound covering every caller's worker count:
+        # resizing by shutdown-and-replace raced concurrent downloads,
+        # whose next submit hit "cannot schedule new futures after
+        # shutdown". Callers bound their own per-call concurrency.
+        self._executor = None
+        self._executor_max_workers = 16
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        """Get the shared fixed-size download executor, creating it lazily."""
+        # Deferred: concurrent.futures is a heavy import the UI may never need
+        import concurrent.futures
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._executor_max_workers,
+                    thread_name_prefix='download')
+            return self._executor
         
     def _get_cache_key(self, ip: str, port: str) -> str:
         """Generate cache key for connection."""
         return f"{ip}:{port}"
 
+    @staticmethod
+    def _write_all(fd: int, data: bytes) -> None:
+        """Write data fully to a raw file descriptor, handling short writes."""
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
+    @classmethod
+    def _writer_loop(cls, write_q: "queue.Queue", fd: int, errors: list) -> None:
+        """Drain buffers from the queue to disk until the None sentinel.
+
+        Runs on a background thread so network reads and disk writes
+        overlap. After a write error, keeps draining so the producer never
+        blocks on a full queue.
+        """
+        while True:
+            buf = write_q.get()
+            if buf is None:
+                return
+            if errors:
+                continue
+            try:
+                cls._write_all(fd, buf)
+            except OSError as e:
+                errors.append(e)
+
+    @staticmethod
+    def _throttled(progress_callback: Optional[Callable], min_interval: float = 0.05):
+        """Wrap a progress callback so it fires at most ~20 Hz.
+
+        UI callbacks typically marshal to the Tk thread; decoupling their
+        rate from chunk granularity avoids thousands of cross-thread hops.
+        The final call (current == total) always goes through.
+        """
+        if progress_callback is None:
+            return None
+        last_call = [0.0]
+
+        def wrapper(current, total):
+            now = time.monotonic()
+            if now - last_call[0] > min_interval or current == total:
+                last_call[0] = now
+                progress_callback(current, total)
+
+        return wrapper
+
+    @staticmethod
+    def _preallocate(fd: int, size: int) -> None:
+        """Reserve contiguous extents for a file about to be written.
+
+        One metadata transaction up front instead of many incremental
+        extensions, and contiguous extents keep later sequential reads fast.
+        No-op where posix_fallocate is unavailable (Windows).
+        """
+        if size > 0 and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        """Hash a file's contents with SHA-256.
+
+        hashlib.file_digest (3.11+) runs the whole loop in C over the
+        OpenSSL backend; the fallback feeds large chunks to amortize the
+        per-call overhead.
+        """
+        with open(path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            h = hashlib.sha256()
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(block)
+            return h.hexdigest()
+
+    @staticmethod
+    def _drop_page_cache(fd: int) -> None:
+        """Flush and advise the kernel to drop cached pages for a finished file.
+
+        Keeps multi-GB downloads from evicting hot pages; no-op where
+        posix_fadvise is unavailable (Windows).
+        """
+        os.fsync(fd)
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+
+    def iter_files(self, ip, port, etag=None):
+        """Yield file entries from the server incrementally.
+
+        With ijson available, the listing is parsed while it streams in, so
+        the first entries are usable before the response completes and peak
+        memory stays bounded by one entry instead of the whole listing.
+        When an etag is given it is sent as If-None-Match; a 304 answer
+        raises _ListingNotModified so the caller can reuse its cached copy.
+        Raises requests/JSON exceptions; callers wanting the (ok, data)
+        convention should use list_files.
+        """
+        url = f"http://{ip}:{port}/api/files"
+        headers = {'If-None-Match': etag} if etag else None
+        if IJSON_AVAILABLE:
+            response = self.session.get(url, stream=True, timeout=15, headers=headers)
+            if response.status_code == 304:
+                raise _ListingNotModified
+            response.raise_for_status()
+            self._record_rtt(ip, port, response.elapsed.total_seconds())
+            self._last_list_etag = response.headers.get('ETag')
+            response.raw.decode_content = True
+            # use_float: without it ijson yields decimal.Decimal for the
+            # modified timestamps, which json.dump in the listing cache
+            # (and any other stdlib-json consumer) refuses to serialize
+            yield from ijson.items(response.raw, 'item', use_float=True)
+        else:
+            response = self.session.get(url, timeout=15, headers=headers)
+            if response.status_code == 304:
+                raise _ListingNotModified
+            response.raise_for_status()
+            self._record_rtt(ip, port, response.elapsed.total_seconds())
+            self._last_list_etag = response.headers.get('ETag')
+            # requests transparently decompresses gzip/deflate bodies, so the
+            # decoded JSON is available directly
+            yield from response.json()
+
+    def _record_rtt(self, ip: str, port: str, rtt: float) -> None:
+        """Remember the most recent request round-trip time for a host."""
+        cache_key = self._get_cache_key(ip, port)
+        with self._cache_lock:
+            entry = self._connection_cache.get(cache_key)
+            if entry is None:
+                entry = self._connection_cache[cache_key] = {
+                    'last_seen': time.time(),
+                    'responsive': True
+                }
+            entry['rtt'] = rtt
+
+    def _get_cached_rtt(self, ip: str, port: str) -> Optional[float]:
+        """Look up the last measured RTT for a host, if any."""
+        with self._cache_lock:
+            entry = self._connection_cache.get(self._get_cache_key(ip, port))
+            return entry.get('rtt') if entry else None
+
+    # Listing cache: one JSON file per sender, revalidated with the
+    # server's listing ETag so reconnects skip the full transfer
+    _LISTING_CACHE_DIR = Path.home() / '.lanshare' / 'listing'
+
+    def _listing_cache_path(self, ip, port):
+        return self._LISTING_CACHE_DIR / f"{ip}_{port}.json"
+
+    def _load_cached_listing(self, ip, port):
+        """Return (etag, data) from the on-disk listing cache, or (None, None)."""
+        try:
+            with open(self._listing_cache_path(ip, port), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return cached.get('etag'), cached.get('data')
+        except (OSError, json.JSONDecodeError, ValueError, AttributeError):
+            return None, None
+
+    def _store_cached_listing(self, ip, port, etag, data):
+        """Atomically persist a listing and its ETag for the next session."""
+        try:
+            self._LISTING_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path = str(self._listing_cache_path(ip, port))
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'etag': etag, 'data': data}, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            # A failed cache write only costs the next revalidation; it
+            # must never take the listing itself down
+            pass
+
     def list_files(self, ip, port):
         """Fetch structured file list from server JSON API with compression support and caching."""
         cache_key = self._get_cache_key(ip, port)
-        url = f"http://{ip}:{port}/api/files"
-        
+
         try:
-            response = self.session.get(url, timeout=15)  # Increased timeout
-            response.raise_for_status()
-            
-            # Handle compressed responses with fallback
-            if response.headers.get('content-encoding') == 'gzip':
-                try:
-                    content = gzip.decompress(response.content)
-                    file_list = json.loads(content.decode('utf-8'))
-                except (gzip.BadGzipFile, OSError) as e:
-                    # Fallback: try to parse as regular JSON if gzip fails
-                    try:
-                        file_list = response.json()
-                    except:
-                        return False, f"Failed to decompress server response: {str(e)}"
-            else:
-                file_list = response.json()
-            
-            # Cache connection info for speed optimization
+            cached_etag, cached_data = self._load_cached_listing(ip, port)
+            try:
+                file_list = list(self.iter_files(
+                    ip, port,
+                    etag=cached_etag if cached_data is not None else None))
+                if self._last_list_etag:
+                    self._store_cached_listing(ip, port, self._last_list_etag, file_list)
+            except _ListingNotModified:
+                # Same listing as last time - re-render from the cache with
+                # no body transferred
+                file_list = cached_data
+
+            # Cache connection info for speed optimization (update in place so
+            # fields like the measured RTT survive)
             with self._cache_lock:
-                self._connection_cache[cache_key] = {
+                entry = self._connection_cache.setdefault(cache_key, {})
+                first_listing = not entry.get('warmed')
+                entry['warmed'] = True
+                entry.update({
                     'last_seen': time.time(),
                     'file_count': len(file_list),
                     'responsive': True
-                }
-                
+                })
+                self._connection_cache.move_to_end(cache_key)
+                # Evict least-recently-updated entries beyond capacity
+                while len(self._connection_cache) > self._cache_capacity:
+                    self._connection_cache.popitem(last=False)
+
+            if first_listing:
+                # Pre-warm off-thread after the first successful listing,
+                # so the pool already holds a live keep-alive socket when
+                # the first download request goes out
+                threading.Thread(target=self.warm_connection,
+                                 args=(ip, port), daemon=True).start()
+
             return True, file_list
         except requests.exceptions.Timeout:
             return False, "Connection timed out. Check IP and Port."
@@ -79,16 +364,15 @@ class HTTPClient:
             return False, "Failed to connect. Is the server running?"
         except json.JSONDecodeError:
             return False, "Invalid response format from server."
-        except (gzip.BadGzipFile, OSError) as e:
-            return False, f"Error processing server response: {str(e)}"
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
 
     def download_file(self, ip, port, file_path, save_path, progress_callback=None, resume=True, 
                      max_retries=3, verify_integrity=True):
         """Download a file with resume support, retry logic, and integrity checking."""
-        url = f"http://{ip}:{port}/download?file={urllib.parse.quote(file_path)}"
-        
+        url = f"http://{ip}:{port}/download?file={_quote_path(file_path)}"
+        progress_callback = self._throttled(progress_callback)
+
         retry_count = 0
         while retry_count <= max_retries:
             try:
@@ -96,28 +380,44 @@ class HTTPClient:
                 parent_dir = Path(save_path).parent
                 parent_dir.mkdir(parents=True, exist_ok=True)
 
-                # Check if partial file exists for resume
+                # Check if partial file exists for resume (single stat instead
+                # of an exists + getsize pair)
                 resume_pos = 0
-                if resume and os.path.exists(save_path):
-                    resume_pos = os.path.getsize(save_path)
-                    headers = {'Range': f'bytes={resume_pos}-'}
-                else:
-                    headers = {}
-                    
+                headers = {}
+                if resume:
+                    try:
+                        resume_pos = os.stat(save_path).st_size
+                        headers['Range'] = f'bytes={resume_pos}-'
+                    except FileNotFoundError:
+                        pass
+
+                # Don't ask for gzip on content that won't compress
+                if os.path.splitext(file_path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+                    headers['Accept-Encoding'] = 'identity'
+
                 # Add ETag support for integrity checking
-                if verify_integrity and os.path.exists(save_path + '.etag'):
+                old_etag = ''
+                if verify_integrity:
                     try:
                         with open(save_path + '.etag', 'r') as f:
-                            headers['If-None-Match'] = f.read().strip()
-                    except:
+                            old_etag = f.read().strip()
+                    except (FileNotFoundError, OSError):
                         pass
+                    # A 304 means "keep what you have", which is only
+                    # valid while the file itself is still on disk - a
+                    # stale sidecar alone must not suppress the download
+                    if old_etag and (resume_pos > 0 or os.path.exists(save_path)):
+                        headers['If-None-Match'] = old_etag
 
                 response = self.session.get(url, stream=True, timeout=60, headers=headers)
                 
                 # Handle not modified (304) response
                 if response.status_code == 304:
                     if progress_callback:
-                        file_size = os.path.getsize(save_path) if os.path.exists(save_path) else 0
+                        try:
+                            file_size = os.stat(save_path).st_size
+                        except FileNotFoundError:
+                            file_size = 0
                         progress_callback(file_size, file_size)
                     return True, "File already up to date!"
                 
@@ -131,44 +431,78 @@ class HTTPClient:
                     response.raise_for_status()
 
                 total_size = int(response.headers.get('content-length', 0)) + resume_pos
-                # Adaptive chunk size based on file size and connection speed
-                chunk_size = self._calculate_optimal_chunk_size(total_size)
+                # Adaptive chunk size based on file size, RTT, and connection speed
+                chunk_size = self._calculate_optimal_chunk_size(
+                    total_size, self._get_cached_rtt(ip, port))
                 downloaded = resume_pos
                 
-                # Save ETag for integrity checking
                 etag = response.headers.get('ETag')
-                if etag and verify_integrity:
+
+                # Write through a raw fd: chunks are MB-sized already, so the
+                # extra Python-level buffer only costs an extra copy
+                flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if mode == 'ab' else os.O_TRUNC)
+                fd = os.open(save_path, flags)
+                try:
+                    if resume_pos == 0:
+                        self._preallocate(fd, total_size)
+
+                    # For big files, overlap disk writes with network reads
+                    # via a background writer thread and a bounded queue
+                    use_writer = total_size > 100 * 1024 * 1024
+                    write_errors = []
+                    if use_writer:
+                        write_q = queue.Queue(maxsize=8)
+                        writer = threading.Thread(
+                            target=self._writer_loop, args=(write_q, fd, write_errors),
+                            daemon=True)
+                        writer.start()
+
                     try:
-                        with open(save_path + '.etag', 'w') as f:
+                        last_chunk_time = time.monotonic()
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            if chunk:
+                                if use_writer:
+                                    write_q.put(chunk)
+                                else:
+                                    self._write_all(fd, chunk)
+                                downloaded += len(chunk)
+
+                                # Track bandwidth to size chunks for future requests
+                                now = time.monotonic()
+                                self._update_bandwidth(len(chunk), now - last_chunk_time)
+                                last_chunk_time = now
+                                chunk_size = self._target_chunk_size(chunk_size)
+
+                                if progress_callback:
+                                    progress_callback(downloaded, total_size)
+                    finally:
+                        if use_writer:
+                            write_q.put(None)
+                            writer.join()
+                    if write_errors:
+                        raise write_errors[0]
+                    self._drop_page_cache(fd)
+                finally:
+                    os.close(fd)
+
+                # Verify the content hash when the server provides one
+                expected_sha = response.headers.get('X-Content-SHA256')
+                if verify_integrity and expected_sha:
+                    if self._file_sha256(save_path) != expected_sha.lower():
+                        return False, "Integrity check failed: SHA-256 mismatch"
+
+                # Record the ETag only after the data is safely on disk, via
+                # atomic rename so a crash can never leave a fresh ETag next
+                # to stale data; skip the write entirely when it hasn't changed
+                if verify_integrity and etag and etag != old_etag:
+                    try:
+                        tmp_path = save_path + '.etag.tmp'
+                        with open(tmp_path, 'w') as f:
                             f.write(etag)
-                    except:
+                        os.replace(tmp_path, save_path + '.etag')
+                    except OSError:
                         pass
 
-                start_time = time.time()
-                with open(save_path, mode) as f:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            
-                            # Adaptive chunk size based on speed
-                            if downloaded > chunk_size * 10:  # After 10 chunks
-                                elapsed = time.time() - start_time
-                                if elapsed > 0:
-                                    speed = downloaded / elapsed
-                                    chunk_size = self._adapt_chunk_size(chunk_size, speed)
-                            
-                            if progress_callback:
-                                progress_callback(downloaded, total_size)
-                
-                # Clean up ETag file on successful download
-                try:
-                    etag_file = save_path + '.etag'
-                    if os.path.exists(etag_file):
-                        os.remove(etag_file)
-                except:
-                    pass
-                    
                 return True, "Download complete!"
                 
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
@@ -182,26 +516,126 @@ class HTTPClient:
                     return False, f"Download failed after {max_retries} retries: {str(e)}"
             except Exception as e:
                 # Only remove file if we were starting fresh (not resuming)
-                if not resume and os.path.exists(save_path):
+                if not resume:
                     try:
                         os.remove(save_path)
-                    except:
+                    except (FileNotFoundError, OSError):
                         pass
                 return False, f"Download failed: {str(e)}"
                 
         return False, f"Download failed after {max_retries} retries"
 
+    def download_file_segmented(self, ip, port, file_path, save_path, segments=4,
+                                progress_callback=None):
+        """Download one large file as parallel HTTP range segments.
+
+        Each segment rides its own TCP connection with an independent
+        congestion window, so the combined flows can fill a high
+        bandwidth-delay-product pipe that a single stream cannot. Falls back
+        to download_file when the server doesn't honor range requests.
+        """
+        url = f"http://{ip}:{port}/download?file={_quote_path(file_path)}"
+
+        # Probe with a 1-byte range to learn the size and range support
+        try:
+            probe = self.session.get(url, headers={'Range': 'bytes=0-0'}, timeout=15)
+            if probe.status_code != 206:
+                return self.download_file(ip, port, file_path, save_path,
+                                          progress_callback=progress_callback)
+            total_size = int(probe.headers.get('Content-Range', '').rpartition('/')[2])
+        except (requests.exceptions.RequestException, ValueError):
+            return self.download_file(ip, port, file_path, save_path,
+                                      progress_callback=progress_callback)
+
+        if total_size <= 0 or segments < 2:
+            return self.download_file(ip, port, file_path, save_path,
+                                      progress_callback=progress_callback)
+
+        try:
+            Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(save_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC)
+        except OSError as e:
+            return False, f"Download failed: {str(e)}"
+
+        try:
+            # Reserve the extents up front so workers can write at their
+            # own offsets without racing to extend the file
+            os.ftruncate(fd, total_size)
+            self._preallocate(fd, total_size)
+
+            seg_size = -(-total_size // segments)  # ceil division
+            ranges = [(start, min(start + seg_size, total_size) - 1)
+                      for start in range(0, total_size, seg_size)]
+
+            downloaded = [0]
+            progress_callback = self._throttled(progress_callback)
+            progress_lock = threading.Lock()
+            chunk_size = self._calculate_optimal_chunk_size(
+                total_size, self._get_cached_rtt(ip, port))
+            write_lock = threading.Lock() if not hasattr(os, 'pwrite') else None
+
+            def fetch_segment(start, end):
+                headers = {'Range': f'bytes={start}-{end}'}
+                response = self.session.get(url, headers=headers, stream=True, timeout=60)
+                if response.status_code != 206:
+                    raise OSError(f"Server returned {response.status_code} for range request")
+                offset = start
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        if write_lock is None:
+                            os.pwrite(fd, chunk, offset)
+                        else:
+                            with write_lock:
+                                os.lseek(fd, offset, os.SEEK_SET)
+                                self._write_all(fd, chunk)
+                        offset += len(chunk)
+                        if progress_callback:
+                            with progress_lock:
+                                downloaded[0] += len(chunk)
+                                progress_callback(downloaded[0], total_size)
+
+            import concurrent.futures
+            executor = self._get_executor()
+            futures = [executor.submit(fetch_segment, start, end)
+                       for start, end in ranges]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+
+            self._drop_page_cache(fd)
+            return True, "Download complete!"
+        except Exception as e:
+            return False, f"Download failed: {str(e)}"
+        finally:
+            os.close(fd)
+
     def download_all(self, ip, port, save_path, progress_callback=None, max_retries=3):
         """Download all files as a zip archive with optimized streaming and retry logic."""
         url = f"http://{ip}:{port}/download_all"
-        
+        # Progress is sampled by a dedicated thread at ~10Hz rather than
+        # reported per chunk, so no throttling wrapper is needed and the
+        # network loop carries zero callback overhead
+
         retry_count = 0
         while retry_count <= max_retries:
             try:
-                response = self.session.get(url, stream=True, timeout=180)  # Longer timeout for large zips
+                # The body is already a zip; transport gzip would just burn
+                # CPU on both ends
+                response = self.session.get(url, stream=True, timeout=180,
+                                            headers={'Accept-Encoding': 'identity'})
                 response.raise_for_status()
 
                 total_size = int(response.headers.get('content-length', 0))
+                if total_size <= 0:
+                    # The chunked zip stream carries no Content-Length.
+                    # The cached listing's summed file sizes are a close
+                    # estimate (level-1 deflate on mixed content shrinks
+                    # little), so progress can still show a percentage;
+                    # without a cached listing the total stays 0 and the
+                    # UI falls back to an indeterminate byte counter
+                    _, cached = self._load_cached_listing(ip, port)
+                    if cached:
+                        total_size = sum(e.get('size', 0) for e in cached
+                                         if e.get('type') == 'file')
                 # Larger chunk size for zip files
                 chunk_size = 4 * 1024 * 1024  # 4MB chunks for better zip streaming
                 downloaded = 0
@@ -209,25 +643,60 @@ class HTTPClient:
                 # Ensure parent directory exists
                 Path(save_path).parent.mkdir(parents=True, exist_ok=True)
 
-                start_time = time.time()
-                with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            
-                            # Adaptive chunk size for zip downloads
-                            if downloaded > chunk_size * 5:
-                                elapsed = time.time() - start_time
-                                if elapsed > 0:
-                                    speed = downloaded / elapsed
-                                    if speed > 20 * 1024 * 1024:  # > 20MB/s
-                                        chunk_size = min(8 * 1024 * 1024, chunk_size * 2)
-                                    elif speed < 1024 * 1024:  # < 1MB/s
-                                        chunk_size = max(1024 * 1024, chunk_size // 2)
-                                        
-                            if progress_callback:
-                                progress_callback(downloaded, total_size)
+                fd = os.open(save_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+                try:
+                    self._preallocate(fd, total_size)
+
+                    # Producer/consumer split: the network loop keeps reading
+                    # while the writer thread drains buffers to disk
+                    write_errors = []
+                    write_q = queue.Queue(maxsize=8)
+                    writer = threading.Thread(
+                        target=self._writer_loop, args=(write_q, fd, write_errors),
+                        daemon=True)
+                    writer.start()
+
+                    # Sampler thread publishes progress off the transfer
+                    # path; a multi-gigabyte archive shouldn't pay a Python
+                    # call per network chunk
+                    downloaded_box = [0]
+                    stop_sampling = threading.Event()
+                    sampler = None
+                    if progress_callback:
+                        def _sample_progress():
+                            while not stop_sampling.wait(0.1):
+                                progress_callback(downloaded_box[0], total_size)
+
+                        sampler = threading.Thread(target=_sample_progress,
+                                                   daemon=True)
+                        sampler.start()
+
+                    try:
+                        last_chunk_time = time.monotonic()
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            if chunk:
+                                write_q.put(chunk)
+                                downloaded += len(chunk)
+                                downloaded_box[0] = downloaded
+
+                                # Track bandwidth to size chunks for future requests
+                                now = time.monotonic()
+                                self._update_bandwidth(len(chunk), now - last_chunk_time)
+                                last_chunk_time = now
+                                chunk_size = self._target_chunk_size(chunk_size)
+                    finally:
+                        if sampler is not None:
+                            stop_sampling.set()
+                            sampler.join()
+                        write_q.put(None)
+                        writer.join()
+                    if progress_callback:
+                        progress_callback(downloaded, total_size)
+                    if write_errors:
+                        raise write_errors[0]
+                    self._drop_page_cache(fd)
+                finally:
+                    os.close(fd)
 
                 return True, "Bulk download complete!"
                 
@@ -235,58 +704,180 @@ class HTTPClient:
                 retry_count += 1
                 if retry_count <= max_retries:
                     # Clean up partial file
-                    if os.path.exists(save_path):
-                        try:
-                            os.remove(save_path)
-                        except:
-                            pass
+                    try:
+                        os.remove(save_path)
+                    except (FileNotFoundError, OSError):
+                        pass
                     # Exponential backoff
                     wait_time = min(2 ** retry_count, 15)
                     time.sleep(wait_time)
                     continue
                 else:
-                    if os.path.exists(save_path):
-                        try:
-                            os.remove(save_path)
-                        except:
-                            pass
-                    return False, f"Bulk download failed after {max_retries} retries: {str(e)}"
-            except Exception as e:
-                if os.path.exists(save_path):
                     try:
                         os.remove(save_path)
-                    except:
+                    except (FileNotFoundError, OSError):
                         pass
+                    return False, f"Bulk download failed after {max_retries} retries: {str(e)}"
+            except Exception as e:
+                try:
+                    os.remove(save_path)
+                except (FileNotFoundError, OSError):
+                    pass
                 return False, f"Bulk download failed: {str(e)}"
                 
         return False, f"Bulk download failed after {max_retries} retries"
     
-    def _calculate_optimal_chunk_size(self, file_size: int) -> int:
-        """Calculate optimal chunk size based on file size."""
+    def _calculate_optimal_chunk_size(self, file_size: int, rtt: Optional[float] = None) -> int:
+        """Calculate optimal chunk size based on file size and measured RTT.
+
+        When RTT and a bandwidth estimate are known, the static table is
+        floored by the minimum size that escapes TCP slow start, so short
+        transfers on high-RTT links don't spend their whole life ramping up.
+        """
         if file_size < 1024 * 1024:  # < 1MB
-            return 64 * 1024  # 64KB
+            size = 64 * 1024  # 64KB
         elif file_size < 100 * 1024 * 1024:  # < 100MB
-            return 1024 * 1024  # 1MB
+            size = 1024 * 1024  # 1MB
         else:
-            return 4 * 1024 * 1024  # 4MB
+            size = 4 * 1024 * 1024  # 4MB
+
+        floor = self._min_efficient_chunk_size(rtt)
+        return min(max(size, floor), 8 * 1024 * 1024)
+
+    def _min_efficient_chunk_size(self, rtt: Optional[float], efficiency: float = 0.95) -> int:
+        """Minimum transfer size reaching `efficiency` of steady-state throughput.
+
+        Models slow start: the window doubles from INITIAL_CWND each round
+        until SLOW_START_THRESHOLD, transferring ramp_bytes below full rate.
+        Sizing the chunk so the ramp is at most (1 - efficiency) of the total
+        amortizes that startup cost.
+        """
+        if not rtt or self._bw_ewma is None:
+            return 0
+        bdp = self._bw_ewma * rtt
+        if bdp <= 0:
+            return 0
+        rounds = max(1, math.ceil(math.log2(max(SLOW_START_THRESHOLD / INITIAL_CWND, 1.0))) + 1)
+        ramp_bytes = INITIAL_CWND * (2 ** rounds - 1)
+        return int(ramp_bytes / (1.0 - efficiency))
     
-    def _adapt_chunk_size(self, current_chunk_size: int, speed_bps: float) -> int:
-        """Adapt chunk size based on connection speed."""
-        # If speed is very low, use smaller chunks
-        if speed_bps < 100 * 1024:  # < 100KB/s
-            return max(32 * 1024, current_chunk_size // 2)
-        # If speed is high, use larger chunks
-        elif speed_bps > 10 * 1024 * 1024:  # > 10MB/s
-            return min(8 * 1024 * 1024, current_chunk_size * 2)
-        return current_chunk_size
-
-    def download_files_parallel(self, ip, port, file_list, base_save_path, progress_callback=None, 
+    def _update_bandwidth(self, nbytes: int, elapsed: float) -> None:
+        """Fold one chunk timing into the EWMA bandwidth estimate.
+
+        Weighting recent samples keeps the estimate responsive to current
+        network conditions, unlike the all-time average it replaces, which a
+        brief stall at start would bias for the whole transfer.
+        """
+        if elapsed <= 0:
+            return
+        inst_bw = nbytes / elapsed
+        if self._bw_ewma is None:
+            self._bw_ewma = inst_bw
+        else:
+            self._bw_ewma = self._bw_alpha * self._bw_ewma + (1 - self._bw_alpha) * inst_bw
+
+    def _target_chunk_size(self, current_chunk_size: int) -> int:
+        """Chunk size targeting ~250ms of transfer at the estimated bandwidth."""
+        if self._bw_ewma is None:
+            return current_chunk_size
+        target = int(self._bw_ewma * 0.25)
+        return max(64 * 1024, min(8 * 1024 * 1024, target))
+
+    async def _download_file_async(self, session, ip, port, file_path, save_path):
+        """Download a single file over a shared aiohttp session, streaming to disk."""
+        url = f"http://{ip}:{port}/download?file={_quote_path(file_path)}"
+        loop = asyncio.get_running_loop()
+        try:
+            Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+            # Mirror the sync path's timeout semantics: bound the connect
+            # and each read stall, never the whole transfer - total= would
+            # kill any file that takes longer than the cap
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60)
+            async with session.get(url, timeout=timeout) as response:
+                response.raise_for_status()
+                total_size = int(response.headers.get('content-length', 0))
+                chunk_size = self._calculate_optimal_chunk_size(total_size)
+                with open(save_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        # Disk writes run off the loop thread, so one slow
+                        # write can't serialize every concurrent download
+                        await loop.run_in_executor(None, f.write, chunk)
+            return True, "Download complete!"
+        except asyncio.TimeoutError:
+            return False, "Download timed out"
+        except aiohttp.ClientError as e:
+            return False, f"Download failed: {str(e)}"
+        except Exception as e:
+            return False, f"Download failed: {str(e)}"
+
+    async def _download_files_async(self, ip, port, files, base_save_path,
+                                    progress_callback=None, max_workers=8):
+        """Download many files concurrently on a single event-loop thread.
+
+        A bounded semaphore limits in-flight requests while one keep-alive
+        connection pool is shared by all of them, avoiding the per-thread
+        stack and context-switch cost of the executor-based path.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+        successful = 0
+        failed = 0
+
+        async def bounded_download(file_info):
+            async with semaphore:
+                save_path = os.path.join(base_save_path, file_info['path'])
+                result = await self._download_file_async(
+                    session, ip, port, file_info['path'], save_path)
+                if not result[0]:
+                    # The async fast path has no resume/retry/integrity
+                    # machinery; give failures one pass through the full
+                    # sync download before counting them as lost
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(
+                        None, self.download_file,
+                        ip, port, file_info['path'], save_path)
+                return file_info, result
+
+        connector = aiohttp.TCPConnector(limit=max_workers, limit_per_host=max_workers,
+                                         keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [asyncio.ensure_future(bounded_download(f)) for f in files]
+            for completed in asyncio.as_completed(tasks):
+                try:
+                    file_info, (success, message) = await completed
+                    if success:
+                        successful += 1
+                    else:
+                        failed += 1
+                        self._error_log.append((time.time(), file_info['path'], message))
+                except Exception as e:
+                    failed += 1
+                    self._error_log.append((time.time(), '<unknown>', str(e)))
+
+                if progress_callback:
+                    progress_callback(successful + failed, len(files))
+
+        return successful, failed
+
+    def download_files_parallel(self, ip, port, file_list, base_save_path, progress_callback=None,
                                 max_workers=None, batch_size=50):
         """Download multiple files in parallel with optimized performance and batching."""
         if max_workers is None:
             # Adaptive worker count based on file count and sizes
             max_workers = self._calculate_optimal_workers(file_list)
-        
+
+        progress_callback = self._throttled(progress_callback)
+
+        # Filter only files (not folders)
+        files_to_download = [f for f in file_list if f.get('type') == 'file']
+
+        # Preferred path: multiplex all downloads over one event-loop thread
+        if AIOHTTP_AVAILABLE:
+            successful, failed = asyncio.run(self._download_files_async(
+                ip, port, files_to_download, base_save_path,
+                progress_callback, max_workers))
+            self._drain_error_log()
+            return successful > 0, f"Downloaded {successful} files, {failed} failed"
+
         def download_single(file_info):
             file_path = file_info['path']
             save_path = os.path.join(base_save_path, file_path)
@@ -295,41 +886,58 @@ class HTTPClient:
 
         successful = 0
         failed = 0
-        total_files = len(file_list)
-        
-        # Filter only files (not folders)
-        files_to_download = [f for f in file_list if f.get('type') == 'file']
-        
-        # Process files in batches to avoid overwhelming the server
-        for batch_start in range(0, len(files_to_download), batch_size):
-            batch_end = min(batch_start + batch_size, len(files_to_download))
-            batch_files = files_to_download[batch_start:batch_end]
-            
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {executor.submit(download_single, file_info): file_info 
-                                 for file_info in batch_files}
-                
-                for future in concurrent.futures.as_completed(future_to_file):
-                    file_info = future_to_file[future]
-                    try:
-                        success, message = future.result()
-                        if success:
-                            successful += 1
-                        else:
-                            failed += 1
-                            print(f"Failed to download {file_info['path']}: {message}")
-                    except Exception as e:
+
+        import concurrent.futures
+        executor = self._get_executor()
+
+        # Keep a window of futures in flight and feed one new file per
+        # completion, so workers stay busy from t=0 instead of waiting for
+        # a full batch to be submitted. The pool is shared and oversized,
+        # so the window is what bounds this call's parallelism at
+        # max_workers (batch_size caps it further)
+        window = max(1, min(max_workers, batch_size))
+        file_iter = iter(files_to_download)
+        pending = {executor.submit(download_single, file_info): file_info
+                   for file_info in itertools.islice(file_iter, window)}
+
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                file_info = pending.pop(future)
+                try:
+                    success, message = future.result()
+                    if success:
+                        successful += 1
+                    else:
                         failed += 1
-                        print(f"Exception downloading {file_info['path']}: {e}")
-                    
-                    if progress_callback:
-                        progress_callback(successful + failed, len(files_to_download))
-            
-            # Small delay between batches to avoid overwhelming the server
-            if batch_end < len(files_to_download):
-                time.sleep(0.1)
+                        self._error_log.append((time.time(), file_info['path'], message))
+                except Exception as e:
+                    failed += 1
+                    self._error_log.append((time.time(), file_info['path'], str(e)))
+
+                if progress_callback:
+                    progress_callback(successful + failed, len(files_to_download))
+
+                next_file = next(file_iter, None)
+                if next_file is not None:
+                    pending[executor.submit(download_single, next_file)] = next_file
 
+        self._drain_error_log()
         return successful > 0, f"Downloaded {successful} files, {failed} failed"
+
+    def _drain_error_log(self):
+        """Flush queued per-file failures as a single log record."""
+        if not self._error_log:
+            return
+        errors = []
+        while self._error_log:
+            try:
+                errors.append(self._error_log.popleft())
+            except IndexError:
+                break
+        logger.error("%d download(s) failed:\n%s", len(errors),
+                     "\n".join(f"{path}: {message}" for _, path, message in errors))
     
     def _calculate_optimal_workers(self, file_list: List[dict]) -> int:
         """Calculate optimal number of worker threads based on file characteristics."""
@@ -345,6 +953,17 @@ class HTTPClient:
         else:
             return min(2, file_count)
     
+    def warm_connection(self, ip: str, port: str) -> None:
+        """Keep a pooled keep-alive connection to the host open.
+
+        A cheap HEAD re-establishes (or refreshes) the pool socket so the
+        next real request skips the connect round trip.
+        """
+        try:
+            self.session.head(f"http://{ip}:{port}/api/files", timeout=5)
+        except requests.exceptions.RequestException:
+            pass
+
     def get_connection_health(self, ip: str, port: str) -> dict:
         """Get connection health information from cache."""
         cache_key = self._get_cache_key(ip, port)
@@ -361,7 +980,11 @@ class HTTPClient:
             self._connection_cache.clear()
 
     def close(self):
-        """Clean up session and connections."""
+        """Clean up session, executor, and connections."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
         if self.session:
             self.session.close()
 
@@ -1,5 +1,8 @@
+import errno
 import http.server
+import socket
 import socketserver
+import sys
 import threading
 import functools
 import os
@@ -10,110 +13,330 @@ import json
 import gzip
 import time
 import hashlib
+import queue
 import re
-from pathlib import Path
+from collections import deque
+from email.utils import formatdate, parsedate_to_datetime
 from concurrent.futures import ThreadPoolExecutor
-import mmap
 from typing import Dict, List, Optional, Tuple
-import tempfile
-import shutil
+
+# Range header forms: explicit "bytes=start-[end]" and suffix "bytes=-N".
+# Anchored so multi-range requests are rejected up front
+_RANGE_RE = re.compile(r'^bytes=(\d+)-(\d*)$')
+_SUFFIX_RANGE_RE = re.compile(r'^bytes=-(\d+)$')
+
+# Optional orjson - native serializer, several times faster than the
+# stdlib on big listings and it returns bytes directly
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# ETags only need a stable content fingerprint, not a cryptographic hash.
+# blake2b is measurably faster than md5; xxhash faster still when installed
+try:
+    import xxhash
+
+    def _fingerprint(data: bytes) -> str:
+        return xxhash.xxh3_128_hexdigest(data)
+except ImportError:
+    def _fingerprint(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+# Optional zstandard support - better ratio and much faster than gzip
+try:
+    import zstandard
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Already-compressed formats gain nothing from deflate; store them raw
+INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp4', '.mkv', '.mov',
+    '.avi', '.mp3', '.aac', '.ogg', '.flac', '.zip', '.gz', '.bz2',
+    '.xz', '.7z', '.rar', '.pdf', '.jar', '.apk', '.woff', '.woff2',
+})
+
+
+def _copy_into(src, dst, buf_size=1024 * 1024):
+    """Copy src to dst through one reusable buffer.
+
+    Like shutil.copyfileobj but reads into a preallocated bytearray, so the
+    bulk copy of large zip entries doesn't allocate a fresh buffer per chunk.
+    """
+    buf = bytearray(buf_size)
+    view = memoryview(buf)
+    while True:
+        n = src.readinto(buf)
+        if not n:
+            break
+        dst.write(view[:n])
+
+
+class _ChunkedWriter:
+    """Minimal file-like wrapper that emits HTTP/1.1 chunked transfer coding.
+
+    ZipFile needs write() and tell(); tell() reports a running byte count of
+    the payload (excluding chunk framing) so zip offsets stay correct.
+    """
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+        self._pos = 0
+
+    def write(self, data):
+        if not data:
+            return 0
+        self._wfile.write(b"%X\r\n" % len(data))
+        self._wfile.write(data)
+        self._wfile.write(b"\r\n")
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def seekable(self):
+        return False
+
+    def flush(self):
+        self._wfile.flush()
+
+    def close(self):
+        """Write the terminating zero-length chunk."""
+        self._wfile.write(b"0\r\n\r\n")
+        self._wfile.flush()
 
 
 class LANShareRequestHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler with JSON API for recursive file listing and zip download."""
 
+    # Chunked transfer coding (the zip stream) only exists in HTTP/1.1,
+    # and 1.1 is also what lets clients keep connections alive for reuse
+    protocol_version = "HTTP/1.1"
+
     # Class-level cache for directory structures with enhanced features
     _dir_cache = {}
     _cache_lock = threading.Lock()
     _cache_ttl = 120  # Cache for 2 minutes (increased from 60)
     _etag_cache = {}  # ETags for integrity checking
+    _compress_lock = threading.Lock()  # One compressor per payload, not per request
+    _sha_cache = {}  # path -> (etag, hexdigest) for the integrity header
+    # Hashing happens before the first response byte leaves, so big files
+    # skip the header rather than stall; the client then relies on ETags
+    _SHA_MAX_BYTES = 64 * 1024 * 1024
 
     def log_message(self, format, *args):
         pass
 
-    def _get_cached_file_list(self, base_dir: str) -> List[Dict]:
-        """Get cached file list or rebuild if expired with better cache management."""
-        with self._cache_lock:
+    @classmethod
+    def _content_sha256(cls, path: str, etag: str, size: int) -> Optional[str]:
+        """Whole-file SHA-256 for X-Content-SHA256, cached per (path, ETag)."""
+        if size > cls._SHA_MAX_BYTES:
+            return None
+        cached = cls._sha_cache.get(path)
+        if cached is not None and cached[0] == etag:
+            return cached[1]
+        try:
+            with open(path, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):
+                    digest = hashlib.file_digest(f, 'sha256').hexdigest()
+                else:
+                    h = hashlib.sha256()
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        h.update(block)
+                    digest = h.hexdigest()
+        except OSError:
+            return None
+        cls._sha_cache[path] = (etag, digest)
+        return digest
+
+    @classmethod
+    def _get_cached_file_list(cls, base_dir: str) -> List[Dict]:
+        """Get cached file list or rebuild if expired."""
+        return cls._get_cached_entry(base_dir)['data']
+
+    @classmethod
+    def _get_cached_entry(cls, base_dir: str) -> Dict:
+        """Get the full cache entry for a directory, rebuilding if expired.
+
+        The entry carries the serialized JSON bytes, its ETag, and lazily
+        filled compressed payloads alongside the raw list, so serialization
+        and hashing happen once per rebuild instead of once per request.
+        """
+        # Lock-free fast path: dict.get is atomic under the GIL and entries
+        # are swapped in whole, so a stale read at worst costs one extra
+        # rebuild - cache hits never contend on the lock
+        entry = cls._dir_cache.get(base_dir)
+        if (entry is not None and
+            time.time() - entry['timestamp'] < cls._cache_ttl):
+            entry['hits'] += 1
+            return entry
+
+        with cls._cache_lock:
             cache_key = base_dir
             current_time = time.time()
-            
-            # Check if cache exists and is not expired
-            if (cache_key in self._dir_cache and 
-                current_time - self._dir_cache[cache_key]['timestamp'] < self._cache_ttl):
-                self._dir_cache[cache_key]['hits'] += 1
-                return self._dir_cache[cache_key]['data']
-            
+
+            # Re-check under the lock: another thread may have rebuilt
+            # while we waited
+            entry = cls._dir_cache.get(cache_key)
+            if (entry is not None and
+                current_time - entry['timestamp'] < cls._cache_ttl):
+                entry['hits'] += 1
+                return entry
+
             # Check if directory modification time hasn't changed (avoid unnecessary rebuilds)
             try:
                 dir_mtime = os.path.getmtime(base_dir)
-                if (cache_key in self._dir_cache and 
-                    self._dir_cache[cache_key].get('dir_mtime') == dir_mtime):
+                if entry is not None and entry.get('dir_mtime') == dir_mtime:
                     # Directory hasn't changed, just update timestamp
-                    self._dir_cache[cache_key]['timestamp'] = current_time
-                    return self._dir_cache[cache_key]['data']
+                    entry['timestamp'] = current_time
+                    return entry
             except OSError:
                 pass
-            
-            # Rebuild cache
-            file_list = self._build_file_list(base_dir)
-            self._dir_cache[cache_key] = {
+
+            # Rebuild cache, serializing and fingerprinting once
+            file_list = cls._build_file_list(base_dir)
+            json_bytes = _dumps(file_list)
+            entry = {
                 'data': file_list,
+                'json_bytes': json_bytes,
+                'etag': _fingerprint(json_bytes),
+                'gzip': None,
+                'zstd': None,
                 'timestamp': current_time,
                 'dir_mtime': dir_mtime if 'dir_mtime' in locals() else current_time,
                 'hits': 0,
                 'size': len(file_list)
             }
-            
+            cls._dir_cache[cache_key] = entry
+
             # Clean old cache entries (keep only last 5)
-            if len(self._dir_cache) > 5:
-                oldest_key = min(self._dir_cache.keys(), 
-                               key=lambda k: self._dir_cache[k]['timestamp'])
-                del self._dir_cache[oldest_key]
-            
-            return file_list
+            if len(cls._dir_cache) > 5:
+                oldest_key = min(cls._dir_cache.keys(),
+                               key=lambda k: cls._dir_cache[k]['timestamp'])
+                del cls._dir_cache[oldest_key]
 
-    def _build_file_list(self, base_dir: str) -> List[Dict]:
-        """Build optimized file list using pathlib with enhanced metadata."""
-        file_list = []
-        base_path = Path(base_dir)
-        
+            return entry
+
+    # Fan the walk out over threads only when the share looks big enough
+    # for the thread plumbing to pay for itself
+    _parallel_scan_threshold = 500
+    _parallel_scan_workers = 8
+
+    @staticmethod
+    def _scan_dir(current_dir: str, prefix_len: int, sink, subdir_sink):
+        """Scan one directory, feeding entries to sink and subdirs to subdir_sink.
+
+        DirEntry objects carry type and stat info cached from the directory
+        read, so each entry costs at most one syscall instead of the three
+        (is_file, is_dir, stat) a pathlib rglob walk pays per entry.
+        """
         try:
-            # Use pathlib for better performance and error handling
-            for file_path in base_path.rglob('*'):
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    try:
+                        rel_path = entry.path[prefix_len:].replace(os.sep, "/")
+
+                        if entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            sink({
+                                # Interned: filenames repeat across a
+                                # tree far more often than they vary
+                                "name": sys.intern(entry.name),
+                                "path": rel_path,
+                                "type": "file",
+                                "size": stat.st_size,
+                                "modified": stat.st_mtime
+                            })
+                        elif entry.is_dir(follow_symlinks=False):
+                            # No stat: nothing consumes folder mtimes,
+                            # so skip the syscall per directory
+                            sink({
+                                "name": sys.intern(entry.name),
+                                "path": rel_path,
+                                "type": "folder",
+                                "size": 0
+                            })
+                            subdir_sink(entry.path)
+                    except (OSError, PermissionError):
+                        # Skip files we can't access
+                        continue
+        except (OSError, PermissionError):
+            pass
+
+    @classmethod
+    def _scan_dirs_parallel(cls, dirs: List[str], prefix_len: int) -> List[Dict]:
+        """Walk a set of directory trees with a small pool of scandir workers.
+
+        Directory enumeration is bound by per-directory syscall latency,
+        so pipelining independent scandir calls across threads overlaps
+        that latency; the GIL is released during the syscalls. deque.append
+        is thread-safe, so workers share one result sink.
+        """
+        results = deque()
+        work = queue.Queue()
+        for d in dirs:
+            work.put(d)
+
+        def worker():
+            while True:
+                d = work.get()
+                if d is None:
+                    break
                 try:
-                    rel_path = file_path.relative_to(base_path)
-                    
-                    if file_path.is_file():
-                        stat = file_path.stat()
-                        file_list.append({
-                            "name": file_path.name,
-                            "path": str(rel_path).replace("\\", "/"),
-                            "type": "file",
-                            "size": stat.st_size,
-                            "modified": stat.st_mtime,
-                            "extension": file_path.suffix.lower()
-                        })
-                    elif file_path.is_dir():
-                        file_list.append({
-                            "name": file_path.name,
-                            "path": str(rel_path).replace("\\", "/"),
-                            "type": "folder",
-                            "size": 0,
-                            "modified": file_path.stat().st_mtime
-                        })
-                except (OSError, PermissionError):
-                    # Skip files we can't access
-                    continue
-                    
+                    # Discovered subdirs go straight back onto the queue
+                    cls._scan_dir(d, prefix_len, results.append, work.put)
+                finally:
+                    work.task_done()
+
+        threads = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(cls._parallel_scan_workers)]
+        for t in threads:
+            t.start()
+        work.join()
+        for _ in threads:
+            work.put(None)
+        for t in threads:
+            t.join()
+        return list(results)
+
+    @classmethod
+    def _build_file_list(cls, base_dir: str) -> List[Dict]:
+        """Build the file list with an os.scandir walk.
+
+        Small shares use a single-threaded iterative walk; when the top
+        level alone yields enough entries, the remaining subtrees are
+        scanned in parallel.
+        """
+        file_list = []
+        prefix_len = len(base_dir.rstrip(os.sep)) + 1
+        subdirs = []
+
+        try:
+            cls._scan_dir(base_dir, prefix_len, file_list.append, subdirs.append)
+
+            if len(file_list) > cls._parallel_scan_threshold and subdirs:
+                file_list.extend(cls._scan_dirs_parallel(subdirs, prefix_len))
+            else:
+                stack = subdirs
+                while stack:
+                    cls._scan_dir(stack.pop(), prefix_len,
+                                  file_list.append, stack.append)
+
         except Exception:
-            # Fallback to old method if pathlib fails
-            return self._build_file_list_fallback(base_dir)
-            
+            # Fallback to old method if scandir fails
+            return cls._build_file_list_fallback(base_dir)
+
         # Sort for consistent ordering
         file_list.sort(key=lambda x: (x['type'] == 'file', x['path'].lower()))
         return file_list
 
-    def _build_file_list_fallback(self, base_dir: str) -> List[Dict]:
+    @staticmethod
+    def _build_file_list_fallback(base_dir: str) -> List[Dict]:
         """Fallback method using os.walk."""
         file_list = []
         
@@ -159,17 +382,32 @@ class LANShareRequestHandler(http.server.SimpleHTTPRequestHandler):
         else:
             super().do_GET()
 
+    def do_HEAD(self):
+        path = urllib.parse.unquote(self.path)
+
+        if path == '/api/files':
+            # Headers-only listing answer, used by clients pre-warming the
+            # keep-alive pool. Falling through to the base handler's 404
+            # would send Connection: close and tear the warmed socket down
+            entry = self._get_cached_entry(self.directory)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(entry['json_bytes'])))
+            self.send_header('ETag', entry['etag'])
+            self.send_header('Cache-Control', 'max-age=60')
+            self.end_headers()
+        else:
+            super().do_HEAD()
+
     def _handle_file_list(self):
         """Return JSON list of all files recursively with enhanced caching and compression."""
         base_dir = self.directory
-        file_list = self._get_cached_file_list(base_dir)
+        entry = self._get_cached_entry(base_dir)
 
-        response_data = json.dumps(file_list, separators=(',', ':')).encode('utf-8')
-        
-        # Generate ETag for file list caching
-        etag = hashlib.md5(response_data).hexdigest()
+        response_data = entry['json_bytes']
+        etag = entry['etag']
         client_etag = self.headers.get('If-None-Match')
-        
+
         # Check if client has current version
         if client_etag == etag:
             self.send_response(304)  # Not Modified
@@ -178,24 +416,38 @@ class LANShareRequestHandler(http.server.SimpleHTTPRequestHandler):
             self.end_headers()
             return
         
-        # Add gzip compression with better error handling
-        should_compress = len(response_data) > 1024
-        
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('ETag', etag)
-        
-        if should_compress:
+        # Compress only above one MTU - below that it rarely pays off.
+        # zstd beats gzip on both speed and ratio when the client takes it;
+        # gzip level 3 is a far better speed/ratio point than 6 for JSON
+        content_encoding = None
+        accept_encoding = self.headers.get('Accept-Encoding', '')
+        if len(response_data) >= 1500:
             try:
-                compressed_data = gzip.compress(response_data, compresslevel=6)
-                # Only use compression if it actually reduces size significantly
-                if len(compressed_data) < len(response_data) * 0.9:
-                    response_data = compressed_data
-                    self.send_header('Content-Encoding', 'gzip')
+                # Double-checked fill: when many browsers refresh at once
+                # only the first request compresses; the rest reuse its bytes
+                if ZSTD_AVAILABLE and 'zstd' in accept_encoding:
+                    if entry['zstd'] is None:
+                        with self._compress_lock:
+                            if entry['zstd'] is None:
+                                entry['zstd'] = _ZSTD_COMPRESSOR.compress(response_data)
+                    response_data = entry['zstd']
+                    content_encoding = 'zstd'
+                elif 'gzip' in accept_encoding:
+                    if entry['gzip'] is None:
+                        with self._compress_lock:
+                            if entry['gzip'] is None:
+                                entry['gzip'] = gzip.compress(response_data, compresslevel=3)
+                    response_data = entry['gzip']
+                    content_encoding = 'gzip'
             except Exception:
                 # If compression fails, send uncompressed data
                 pass
-            
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
         self.send_header('Content-Length', str(len(response_data)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Cache-Control', 'max-age=60')
@@ -223,12 +475,24 @@ class LANShareRequestHandler(http.server.SimpleHTTPRequestHandler):
             
             # Generate ETag based on file size and modification time
             etag = f'"{file_size}-{int(file_mtime)}"'
-            client_etag = self.headers.get('If-None-Match')
-            
-            # Check if client has current version
-            if client_etag == etag:
+            last_modified = formatdate(file_mtime, usegmt=True)
+
+            # Conditional GET: match on ETag or If-Modified-Since, and
+            # short-circuit before any range handling or file access
+            not_modified = self.headers.get('If-None-Match') == etag
+            if not not_modified:
+                ims = self.headers.get('If-Modified-Since')
+                if ims:
+                    try:
+                        not_modified = int(file_mtime) <= int(
+                            parsedate_to_datetime(ims).timestamp())
+                    except (TypeError, ValueError):
+                        pass
+
+            if not_modified:
                 self.send_response(304)  # Not Modified
                 self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
                 self.send_header('Cache-Control', 'max-age=3600')
                 self.end_headers()
                 return
@@ -239,12 +503,20 @@ class LANShareRequestHandler(http.server.SimpleHTTPRequestHandler):
             end_byte = file_size - 1
             
             if range_header:
-                range_match = re.match(r'bytes=(\d+)-(\d*)', range_header)
+                range_match = _RANGE_RE.match(range_header)
+                suffix_match = None if range_match else _SUFFIX_RANGE_RE.match(range_header)
                 if range_match:
                     start_byte = int(range_match.group(1))
                     if range_match.group(2):
                         end_byte = int(range_match.group(2))
-                    
+
+                    self.send_response(206)  # Partial Content
+                    self.send_header('Content-Range', f'bytes {start_byte}-{end_byte}/{file_size}')
+                elif suffix_match:
+                    # "bytes=-N": the last N bytes, used by clients seeking
+                    # the tail of a file
+                    start_byte = file_size - min(int(suffix_match.group(1)), file_size)
+
                     self.send_response(206)  # Partial Content
                     self.send_header('Content-Range', f'bytes {start_byte}-{end_byte}/{file_size}')
                 else:
@@ -259,110 +531,185 @@ class LANShareRequestHandler(http.server.SimpleHTTPRequestHandler):
             self.send_header('Content-Length', str(content_length))
             self.send_header('Accept-Ranges', 'bytes')
             self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
             self.send_header('Cache-Control', 'max-age=3600')
+            # Whole-file digest (valid for range responses too - the
+            # client verifies the assembled file), so downloads can catch
+            # silent corruption rather than just staleness
+            content_sha = self._content_sha256(full_path, etag, file_size)
+            if content_sha:
+                self.send_header('X-Content-SHA256', content_sha)
             self.end_headers()
 
-            # Use memory mapping for large files (>50MB) to reduce memory usage
-            if file_size > 50 * 1024 * 1024:
-                self._stream_large_file_range(full_path, start_byte, end_byte)
-            else:
-                self._stream_file_range(full_path, start_byte, end_byte)
-                
+            self._send_file_range(full_path, start_byte, end_byte)
+
         except Exception as e:
             self.send_error(500, str(e))
 
+    def _send_file_range(self, file_path: str, start_byte: int, end_byte: int):
+        """Send a file range, preferring zero-copy sendfile over a read loop."""
+        content_length = end_byte - start_byte + 1
+
+        # Cork the socket (Linux) so headers and the first file pages
+        # coalesce into full packets, and disable Nagle for the rest
+        corked = False
+        try:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, 'TCP_CORK'):
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+                corked = True
+        except OSError:
+            pass
+
+        try:
+            # Headers are buffered in wfile; push them out before handing
+            # the socket to sendfile
+            self.wfile.flush()
+            with open(file_path, 'rb') as f:
+                try:
+                    # Kernel copies file pages straight into the socket
+                    # buffer — no user-space copy, no per-chunk Python work
+                    self.connection.sendfile(f, offset=start_byte, count=content_length)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                except OSError as e:
+                    # Fall back to a read loop only when sendfile is
+                    # unsupported for this file/socket combination, which
+                    # fails before any bytes hit the wire. A mid-transfer
+                    # error may already have sent part of the body, and
+                    # re-streaming from start_byte would duplicate data -
+                    # abort the connection instead
+                    if e.errno in (errno.EINVAL, errno.ENOTSOCK, errno.ENOSYS):
+                        self._stream_file_range(file_path, start_byte, end_byte)
+                    else:
+                        self.close_connection = True
+                        return
+        finally:
+            if corked:
+                try:
+                    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+                except OSError:
+                    pass
+
     def _stream_file_range(self, file_path: str, start_byte: int, end_byte: int):
-        """Stream file range with optimized chunk size."""
-        chunk_size = min(1024 * 1024, end_byte - start_byte + 1)  # 1MB chunks or file size
+        """Stream file range through one reusable buffer.
+
+        readinto a preallocated 256 KB bytearray avoids allocating a fresh
+        bytes object per iteration, and the full-buffer loop needs no
+        per-iteration min() - only the final partial read is sized.
+        """
+        chunk_size = 256 * 1024
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
         with open(file_path, 'rb') as f:
             f.seek(start_byte)
             remaining = end_byte - start_byte + 1
+            while remaining >= chunk_size:
+                n = f.readinto(buf)
+                if not n:
+                    return
+                self.wfile.write(view[:n])
+                remaining -= n
             while remaining > 0:
-                chunk_size = min(chunk_size, remaining)
-                chunk = f.read(chunk_size)
+                chunk = f.read(remaining)
                 if not chunk:
                     break
                 self.wfile.write(chunk)
                 remaining -= len(chunk)
 
-    def _stream_large_file_range(self, file_path: str, start_byte: int, end_byte: int):
-        """Stream large file range using memory mapping for better memory efficiency."""
-        try:
-            with open(file_path, 'rb') as f:
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped_file:
-                    chunk_size = 2 * 1024 * 1024  # 2MB chunks for large files
-                    remaining = end_byte - start_byte + 1
-                    offset = start_byte
-                    while remaining > 0:
-                        chunk_size = min(chunk_size, remaining)
-                        chunk = mmapped_file[offset:offset + chunk_size]
-                        self.wfile.write(chunk)
-                        offset += chunk_size
-                        remaining -= chunk_size
-        except (ValueError, MemoryError):
-            # Fallback to regular streaming if mmap fails
-            self._stream_file_range(file_path, start_byte, end_byte)
-
     def _handle_download_all(self):
-        """Download entire directory as zip with optimized streaming and better memory management."""
+        """Download entire directory as a zip streamed straight to the socket.
+
+        The archive is never materialized on disk: compressed bytes flow to
+        the client as each entry is written, so the first byte arrives
+        immediately and disk I/O is limited to reading the source files once.
+        """
         base_dir = self.directory
         root_name = os.path.basename(base_dir.rstrip(os.sep))
-        
+
         self.send_response(200)
         self.send_header('Content-Type', 'application/zip')
         self.send_header('Content-Disposition', f'attachment; filename="{root_name}.zip"')
-        
-        # Use temporary file for zip creation
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_path = temp_file.name
-            
-            try:
-                with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
-                    base_path = Path(base_dir)
-                    
-                    for file_path in base_path.rglob('*'):
-                        try:
-                            if file_path.is_file():
-                                rel_path = file_path.relative_to(base_path)
-                                arcname = str(Path(root_name) / rel_path)
-                                zf.write(str(file_path), arcname)
-                            elif file_path.is_dir() and not any(file_path.iterdir()):
-                                rel_path = file_path.relative_to(base_path)
-                                arcname = str(Path(root_name) / rel_path) + '/'
-                                zf.writestr(arcname, '')
-                        except (OSError, PermissionError):
-                            continue
-                
-                # Send the zip file
-                zip_size = os.path.getsize(temp_path)
-                self.send_header('Content-Length', str(zip_size))
-                self.end_headers()
-                
-                chunk_size = 2 * 1024 * 1024  # 2MB chunks
-                with open(temp_path, 'rb') as zf:
-                    while True:
-                        chunk = zf.read(chunk_size)
-                        if not chunk:
-                            break
-                        self.wfile.write(chunk)
-                    
-            finally:
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    pass
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        writer = _ChunkedWriter(self.wfile)
+        try:
+            # Drive the zip from the cached listing instead of a second
+            # rglob walk - no duplicate stat storm, and the archive always
+            # matches what /api/files advertised
+            entries = self._get_cached_file_list(base_dir)
+
+            # Level 1 runs several times faster than the default for a
+            # negligible ratio loss on the mixed content typical of a share
+            with zipfile.ZipFile(writer, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=1, allowZip64=True) as zf:
+                for entry in entries:
+                    if entry['type'] != 'file':
+                        continue
+                    try:
+                        src_path = os.path.join(base_dir, entry['path'])
+                        arcname = f"{root_name}/{entry['path']}"
+                        zinfo = zipfile.ZipInfo.from_file(src_path, arcname)
+                        # zf.open honors the per-entry zinfo, which
+                        # ZipInfo.from_file initializes to STORED - the
+                        # archive-level deflate default is ignored, so the
+                        # compression choice must be set here either way
+                        if os.path.splitext(entry['name'])[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+                            zinfo.compress_type = zipfile.ZIP_STORED
+                        else:
+                            zinfo.compress_type = zipfile.ZIP_DEFLATED
+                            zinfo._compresslevel = 1
+                        with open(src_path, 'rb') as src, \
+                                zf.open(zinfo, 'w') as dst:
+                            _copy_into(src, dst)
+                    except (OSError, PermissionError):
+                        continue
+            writer.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away mid-stream; nothing to clean up
+            pass
 
 
-class OptimizedThreadedHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
-    """Optimized threaded server with better performance characteristics."""
+class OptimizedThreadedHTTPServer(socketserver.TCPServer):
+    """Optimized thread-pooled server with better performance characteristics.
+
+    All request threads come from the executor; ThreadingMixIn is not used
+    so there is exactly one thread-creation path.
+    """
     allow_reuse_address = True
-    daemon_threads = True
     request_queue_size = 100
-    
+
     def __init__(self, server_address, RequestHandlerClass, bind_and_activate=True):
         super().__init__(server_address, RequestHandlerClass, bind_and_activate)
-        # Use thread pool executor for better thread management
-        self.executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4))
+        # Use thread pool executor for better thread management. Handlers
+        # spend almost all their time blocked on socket/disk I/O, so the
+        # pool is sized for concurrency, not CPU count
+        self.executor = ThreadPoolExecutor(
+            max_workers=min(128, 4 * (os.cpu_count() or 1)),
+            thread_name_prefix='lanshare')
+
+    def server_bind(self):
+        # SO_REUSEPORT (where available) keeps the door open to multiple
+        # accepting processes sharing the port later
+        if hasattr(socket, 'SO_REUSEPORT'):
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        super().server_bind()
+
+    def get_request(self):
+        conn, addr = super().get_request()
+        # A large send buffer keeps the in-flight window full for sendfile
+        # on a LAN; NODELAY cuts latency for the small JSON responses
+        try:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+        return conn, addr
     
     def process_request_thread(self, request, client_address):
         """Process request in thread pool."""
@@ -395,6 +742,13 @@ class HTTPServerManager:
             self.server_thread = threading.Thread(target=self.httpd.serve_forever)
             self.server_thread.daemon = True
             self.server_thread.start()
+
+            # Warm the directory cache in the background so the first
+            # /api/files request is a cache hit instead of paying the walk
+            threading.Thread(
+                target=LANShareRequestHandler._get_cached_entry,
+                args=(self.directory,), daemon=True).start()
+
             return True, f"Server started at {ip}:{self.port}"
         except OSError as e:
             if e.errno == 98:
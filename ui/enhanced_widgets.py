@@ -6,6 +6,7 @@ Provides improved user experience with history, auto-completion, and responsiven
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
+import functools
 import os
 from pathlib import Path
 from typing import List, Callable, Optional
@@ -13,6 +14,43 @@ import time
 from utils.config import config, ConnectionEntry, FolderEntry
 
 
+# Shared font tuples and palette - one interned object per style instead of
+# a fresh tuple/string per widget construction
+FONT_BODY = ("Segoe UI", 12)
+FONT_LABEL = ("Segoe UI", 11)
+FONT_SMALL = ("Segoe UI", 10)
+FONT_TINY = ("Segoe UI", 9)
+FONT_ICON = ("Segoe UI", 14)
+FONT_MONO = ("Consolas", 9)
+FONT_BODY_SEMIBOLD = ("Segoe UI Semibold", 12)
+FONT_LABEL_SEMIBOLD = ("Segoe UI Semibold", 11)
+
+COLOR_POPUP_BG = "#2b2b3d"
+COLOR_BORDER = "#3a3a50"
+COLOR_CARD = "#35354a"
+COLOR_CARD_HOVER = "#404050"
+COLOR_TEXT = "#e4e4e8"
+COLOR_TEXT_SECONDARY = "#9090a0"
+COLOR_TEXT_DIM = "#6c6c80"
+COLOR_ACCENT = "#0078d4"
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_size(size_bytes: int) -> str:
+    """Format a byte count, picking the unit from the bit length in O(1).
+
+    Cached because the UI shows the same handful of sizes over and over.
+    """
+    if size_bytes <= 0:
+        return "0 B"
+    i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    if i == 0:
+        return f"{size_bytes} B"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
+
+
 class RecentConnectionsDropdown(ctk.CTkFrame):
     """Dropdown widget for recent connections with management options."""
     
@@ -20,6 +58,8 @@ class RecentConnectionsDropdown(ctk.CTkFrame):
         super().__init__(master, **kwargs)
         self.on_select_callback = on_select_callback
         self.connections = config.get_recent_connections()
+        self._suggest_job = None
+        self._hide_bboxes = None
         self._build_ui()
     
     def _build_ui(self):
@@ -31,101 +71,176 @@ class RecentConnectionsDropdown(ctk.CTkFrame):
         ip_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
         ip_frame.pack(side="left", fill="x", expand=True)
         
-        ctk.CTkLabel(ip_frame, text="IP Address:", font=("Segoe UI", 11), 
-                     text_color="#9090a0").pack(anchor="w")
+        ctk.CTkLabel(ip_frame, text="IP Address:", font=FONT_LABEL, 
+                     text_color=COLOR_TEXT_SECONDARY).pack(anchor="w")
         self.ip_var = ctk.StringVar()
         self.ip_entry = ctk.CTkEntry(ip_frame, textvariable=self.ip_var,
                                      placeholder_text="192.168.x.x",
-                                     font=("Segoe UI", 12), height=32)
+                                     font=FONT_BODY, height=32)
         self.ip_entry.pack(fill="x", pady=(2, 0))
         
         # Port Entry with label
         port_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
         port_frame.pack(side="left", padx=(12, 0))
         
-        ctk.CTkLabel(port_frame, text="Port:", font=("Segoe UI", 11), 
-                     text_color="#9090a0").pack(anchor="w")
+        ctk.CTkLabel(port_frame, text="Port:", font=FONT_LABEL, 
+                     text_color=COLOR_TEXT_SECONDARY).pack(anchor="w")
         self.port_var = ctk.StringVar(value=config.settings.default_port)
         self.port_entry = ctk.CTkEntry(port_frame, textvariable=self.port_var,
-                                       width=80, font=("Segoe UI", 12), height=32)
+                                       width=80, font=FONT_BODY, height=32)
         self.port_entry.pack(pady=(2, 0))
 
         # ── Suggestions Popup (Hidden by default) ──
-        self.suggestions_frame = ctk.CTkFrame(self, fg_color="#2b2b3d", corner_radius=8, 
-                                             border_width=1, border_color="#3a3a50")
+        self.suggestions_frame = ctk.CTkFrame(self, fg_color=COLOR_POPUP_BG, corner_radius=8, 
+                                             border_width=1, border_color=COLOR_BORDER)
         # Do not pack yet
 
-        self.suggestions_scroll = ctk.CTkScrollableFrame(self.suggestions_frame, height=0, fg_color="transparent")
+        # Fixed height: resizing the scroll per keystroke forces a full
+        # geometry re-layout, and packed/forgotten rows look the same anyway
+        self.suggestions_scroll = ctk.CTkScrollableFrame(self.suggestions_frame, height=200, fg_color="transparent")
         self.suggestions_scroll.pack(fill="both", expand=True, padx=4, pady=4)
 
-        # Bindings for search-as-you-type
-        self.ip_entry.bind("<KeyRelease>", lambda e: self._update_suggestions())
+        # Pool of reusable suggestion rows - widget creation is expensive in
+        # CustomTkinter (each allocates a canvas), so build the 5 rows once
+        # and just retarget/show/hide them as the filter changes
+        self._suggestion_rows = [self._make_suggestion_row() for _ in range(5)]
+
+        # Bindings for search-as-you-type (debounced so fast typing doesn't
+        # rebuild the list on every keystroke)
+        self.ip_entry.bind("<KeyRelease>", self._schedule_update_suggestions)
         self.ip_entry.bind("<FocusIn>", lambda e: self._update_suggestions())
         
-        # Global click binding to hide suggestions (handled via master)
-        self.master.bind("<Button-1>", self._check_hide_suggestions, add="+")
+        # Global click binding to hide suggestions (handled via master).
+        # Keep the funcid so destroy() can release it - add="+" bindings
+        # otherwise outlive the widget and fire on a dead one
+        self._click_funcid = self.master.bind(
+            "<Button-1>", self._check_hide_suggestions, add="+")
+
+        # Cached geometry goes stale when the layout moves
+        self.bind("<Configure>", self._invalidate_hide_bboxes, add="+")
+
+    def refresh_connections(self):
+        """Re-read connection history; suggestions filter the live list."""
+        self.connections = config.get_recent_connections()
+
+    def _schedule_update_suggestions(self, event=None):
+        """Coalesce keystroke bursts into one rebuild after 120ms idle."""
+        if self._suggest_job is not None:
+            self.after_cancel(self._suggest_job)
+        self._suggest_job = self.after(120, self._update_suggestions)
 
     def _update_suggestions(self):
         """Filter and show suggestions based on current input."""
+        self._suggest_job = None
         query = self.ip_var.get().strip().lower()
         
         # Filter connections
         filtered = [c for c in self.connections if query in c.ip.lower()]
-        
-        # Clear old items
-        for w in self.suggestions_scroll.winfo_children():
-            w.destroy()
-            
+
         if not filtered or (len(filtered) == 1 and filtered[0].ip == query):
             self.suggestions_frame.pack_forget()
             return
 
-        # Limit to 5 results to keep it compact
-        for conn in filtered[:5]:
-            self._create_suggestion_item(self.suggestions_scroll, conn)
-            
-        # Update frame size and show
-        height = min(160, len(filtered[:5]) * 40)
-        self.suggestions_scroll.configure(height=height)
+        # Limit to 5 results to keep it compact; retarget the pooled rows
+        shown = filtered[:5]
+        for row, conn in zip(self._suggestion_rows, shown):
+            row._conn = conn
+            row._text_var.set(f"🕒 {conn.ip}:{conn.port}")
+            row.pack(fill="x", pady=1)
+        for row in self._suggestion_rows[len(shown):]:
+            row.pack_forget()
+
+        # Show the popup (scroll height is fixed; rows above were packed)
         self.suggestions_frame.pack(fill="x", padx=4, pady=(4, 0))
 
-    def _create_suggestion_item(self, parent, connection: ConnectionEntry):
-        """Create a suggestion item that fills values when clicked."""
-        item = ctk.CTkFrame(parent, fg_color="#35354a", corner_radius=6, cursor="hand2", height=34)
-        item.pack(fill="x", pady=1)
+        # Record geometry once the layout settles so click-outside checks
+        # don't have to ask Tcl per click
+        self._hide_bboxes = None
+        self.after_idle(self._cache_hide_bboxes)
+
+    def _invalidate_hide_bboxes(self, event=None):
+        self._hide_bboxes = None
+
+    def _cache_hide_bboxes(self):
+        """Snapshot entry/suggestion geometry for the click-outside test."""
+        try:
+            boxes = []
+            for w in (self.ip_entry, self.suggestions_frame):
+                x, y = w.winfo_rootx(), w.winfo_rooty()
+                boxes.append((x, y, x + w.winfo_width(), y + w.winfo_height()))
+            self._hide_bboxes = boxes
+        except Exception:
+            self._hide_bboxes = None
+
+    def _make_suggestion_row(self):
+        """Build one reusable suggestion row (hidden until configured)."""
+        item = ctk.CTkFrame(self.suggestions_scroll, fg_color=COLOR_CARD,
+                            corner_radius=6, cursor="hand2", height=34)
         item.pack_propagate(False)
-        
+        item._conn = None
+        item._text_var = ctk.StringVar()
+
+        lbl = ctk.CTkLabel(item, textvariable=item._text_var,
+                           font=FONT_BODY, text_color=COLOR_TEXT, anchor="w")
+        lbl.pack(side="left", padx=10, fill="x", expand=True)
+
         def on_click(e=None):
+            connection = item._conn
+            if connection is None:
+                return
             self.ip_var.set(connection.ip)
             self.port_var.set(connection.port)
             self.suggestions_frame.pack_forget()
             if self.on_select_callback:
                 self.on_select_callback()
-        
+
         item.bind("<Button-1>", on_click)
-        
-        lbl = ctk.CTkLabel(item, text=f"🕒 {connection.ip}:{connection.port}", 
-                           font=("Segoe UI", 12), text_color="#e4e4e8", anchor="w")
-        lbl.pack(side="left", padx=10, fill="x", expand=True)
         lbl.bind("<Button-1>", on_click)
 
         # Hover
-        item.bind("<Enter>", lambda e: item.configure(fg_color="#404050"))
-        item.bind("<Leave>", lambda e: item.configure(fg_color="#35354a"))
+        item.bind("<Enter>", lambda e: item.configure(fg_color=COLOR_CARD_HOVER))
+        item.bind("<Leave>", lambda e: item.configure(fg_color=COLOR_CARD))
+        return item
+
+    def destroy(self):
+        """Release the click hook on master before tearing down."""
+        if self._click_funcid is not None:
+            # Misc.unbind(seq, funcid) isn't targeted - it clears *every*
+            # <Button-1> binding on master. Strip only our own script line
+            # from the bound script and rebind the rest, then drop the
+            # command (the documented workaround)
+            try:
+                script = self.master.bind("<Button-1>")
+                kept = "\n".join(
+                    line for line in script.split("\n")
+                    if self._click_funcid not in line)
+                self.master.bind("<Button-1>", kept)
+                self.master.deletecommand(self._click_funcid)
+            except tk.TclError:
+                pass
+            self._click_funcid = None
+        super().destroy()
 
     def _check_hide_suggestions(self, event):
         """Hide suggestions if clicked outside the entry or frame."""
+        if not self.winfo_exists():
+            return
         if not self.suggestions_frame.winfo_ismapped():
             return
-            
+
+        # Compare against cached geometry - no Tcl round-trips per click
+        boxes = self._hide_bboxes
+        if boxes is None:
+            self._cache_hide_bboxes()
+            boxes = self._hide_bboxes
+            if boxes is None:
+                return
+
         x, y = event.x_root, event.y_root
-        
-        # Check if click is within entry or suggestions frame
-        for w in [self.ip_entry, self.suggestions_frame]:
-            if (w.winfo_rootx() <= x <= w.winfo_rootx() + w.winfo_width() and
-                w.winfo_rooty() <= y <= w.winfo_rooty() + w.winfo_height()):
+        for x1, y1, x2, y2 in boxes:
+            if x1 <= x <= x2 and y1 <= y <= y2:
                 return
-                
+
         self.suggestions_frame.pack_forget()
 
     def get_ip(self) -> str:
@@ -141,11 +256,34 @@ class RecentConnectionsDropdown(ctk.CTkFrame):
 
 class ImprovedFolderSelector(ctk.CTkFrame):
     """Enhanced folder selector with recent folders and favorites."""
-    
+
+    # Class-level so scan results survive frame switches; keyed by path,
+    # valid while the root directory mtime is unchanged
+    _folder_stat_cache: dict = {}
+
+    # Shared pool for existence checks - os.path.exists on a disconnected
+    # network drive can block for hundreds of ms per path
+    _exists_executor = None
+
+    @classmethod
+    def _get_exists_executor(cls):
+        if cls._exists_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            cls._exists_executor = ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix='folder-exists')
+        return cls._exists_executor
+
     def __init__(self, master, on_select_callback: Optional[Callable] = None, **kwargs):
         super().__init__(master, **kwargs)
         self.on_select_callback = on_select_callback
         self.recent_folders = config.get_recent_folders()
+        # Truncate display paths once per entry here; rows (and any
+        # re-render of them) then reuse the string instead of slicing again
+        for folder in self.recent_folders:
+            if not hasattr(folder, '_display_path'):
+                folder._display_path = self._truncate_path(folder.path, 60)
+        self._scan_gen = 0
+        self._scan_debounce = None
         self.selected_path = ctk.StringVar()
         self.selected_path.trace('w', self._on_path_change)
         self._build_ui()
@@ -155,14 +293,14 @@ class ImprovedFolderSelector(ctk.CTkFrame):
         input_frame = ctk.CTkFrame(self, fg_color="transparent")
         input_frame.pack(fill="x", padx=4, pady=2)
         
-        ctk.CTkLabel(input_frame, text="Selected Folder:", font=("Segoe UI", 11),
-                     text_color="#9090a0").pack(anchor="w")
+        ctk.CTkLabel(input_frame, text="Selected Folder:", font=FONT_LABEL,
+                     text_color=COLOR_TEXT_SECONDARY).pack(anchor="w")
         
         path_row = ctk.CTkFrame(input_frame, fg_color="transparent")
         path_row.pack(fill="x", pady=(2, 0))
         
         self.path_entry = ctk.CTkEntry(path_row, textvariable=self.selected_path,
-                                       font=("Segoe UI", 12), height=32,
+                                       font=FONT_BODY, height=32,
                                        placeholder_text="Click Browse or select from recent folders")
         self.path_entry.pack(side="left", fill="x", expand=True, padx=(0, 8))
         
@@ -172,106 +310,148 @@ class ImprovedFolderSelector(ctk.CTkFrame):
         self.browse_btn.pack(side="right")
         
         # Folder info
-        self.info_label = ctk.CTkLabel(input_frame, text="", font=("Segoe UI", 10),
-                                       text_color="#6c6c80")
+        self.info_label = ctk.CTkLabel(input_frame, text="", font=FONT_SMALL,
+                                       text_color=COLOR_TEXT_DIM)
         self.info_label.pack(anchor="w", pady=(4, 0))
         
         # Recent folders section
+        self._recent_frame = None
         if self.recent_folders:
-            recent_frame = ctk.CTkFrame(self, fg_color="#2b2b3d", corner_radius=8)
-            recent_frame.pack(fill="both", expand=True, padx=4, pady=(8, 4))
-            
-            header_frame = ctk.CTkFrame(recent_frame, fg_color="transparent")
-            header_frame.pack(fill="x", padx=12, pady=(8, 4))
-            
-            ctk.CTkLabel(header_frame, text="Recent Folders:", 
-                         font=("Segoe UI Semibold", 11), text_color="#e4e4e8").pack(side="left")
-            
-            clear_btn = ctk.CTkButton(header_frame, text="Clear", command=self._clear_history,
-                                      width=60, height=24, corner_radius=4,
-                                      fg_color="transparent", text_color="#9090a0",
-                                      hover_color="#35354a", font=("Segoe UI", 9))
-            clear_btn.pack(side="right")
-            
-            # Scrollable frame for folders
-            max_height = min(200, len(self.recent_folders) * 45)
-            self.recent_scroll = ctk.CTkScrollableFrame(recent_frame, height=max_height)
-            self.recent_scroll.pack(fill="both", expand=True, padx=8, pady=(0, 8))
-            
-            for folder in self.recent_folders[:10]:  # Show up to 10 recent folders
-                if os.path.exists(folder.path):  # Only show existing folders
-                    self._create_folder_item(self.recent_scroll, folder)
+            self._build_recent_section()
+
+    def refresh_folders(self):
+        """Re-read folder history and rebuild the recent-folders panel.
+
+        Panels are cached across frame switches, so folders added while
+        this one was hidden (or the first folder ever, when the section
+        was skipped at build time) only appear through this path.
+        """
+        self.recent_folders = config.get_recent_folders()
+        for folder in self.recent_folders:
+            if not hasattr(folder, '_display_path'):
+                folder._display_path = self._truncate_path(folder.path, 60)
+        if self._recent_frame is not None:
+            self._recent_frame.destroy()
+            self._recent_frame = None
+        if self.recent_folders:
+            self._build_recent_section()
+
+    def _build_recent_section(self):
+        """Build the recent-folders panel (kept separate so clearing the
+        history can drop just this subtree instead of rebuilding the UI)."""
+        self._recent_frame = ctk.CTkFrame(self, fg_color=COLOR_POPUP_BG, corner_radius=8)
+        self._recent_frame.pack(fill="both", expand=True, padx=4, pady=(8, 4))
+
+        header_frame = ctk.CTkFrame(self._recent_frame, fg_color="transparent")
+        header_frame.pack(fill="x", padx=12, pady=(8, 4))
+
+        ctk.CTkLabel(header_frame, text="Recent Folders:",
+                     font=FONT_LABEL_SEMIBOLD, text_color=COLOR_TEXT).pack(side="left")
+
+        clear_btn = ctk.CTkButton(header_frame, text="Clear", command=self._clear_history,
+                                  width=60, height=24, corner_radius=4,
+                                  fg_color="transparent", text_color=COLOR_TEXT_SECONDARY,
+                                  hover_color=COLOR_CARD, font=FONT_TINY)
+        clear_btn.pack(side="right")
+
+        # Scrollable frame for folders
+        max_height = min(200, len(self.recent_folders) * 45)
+        self.recent_scroll = ctk.CTkScrollableFrame(self._recent_frame, height=max_height)
+        self.recent_scroll.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+
+        # Existence checks run off the Tk thread and in parallel, then the
+        # surviving rows are revealed in order - building the panel never
+        # blocks on a slow or unplugged drive
+        candidates = self.recent_folders[:10]  # Show up to 10 recent folders
+
+        def check_and_reveal():
+            checks = list(self._get_exists_executor().map(
+                os.path.exists, [f.path for f in candidates]))
+
+            def reveal():
+                if not self.recent_scroll.winfo_exists():
+                    return
+                for folder, exists in zip(candidates, checks):
+                    if exists:  # Only show existing folders
+                        self._create_folder_item(self.recent_scroll, folder)
+            self.after(0, reveal)
+
+        import threading
+        threading.Thread(target=check_and_reveal, daemon=True).start()
     
     def _create_folder_item(self, parent, folder: FolderEntry):
         """Create a single folder item widget."""
-        item_frame = ctk.CTkFrame(parent, fg_color="transparent", height=40)
-        item_frame.pack(fill="x", pady=1)
-        item_frame.pack_propagate(False)
-        
-        # Folder button (clickable area)
-        btn_frame = ctk.CTkFrame(item_frame, fg_color="#35354a", corner_radius=6, 
+        # One frame, grid layout - the old item/btn/info/name nesting meant
+        # four CTkFrame canvases per row where one carries the whole look
+        btn_frame = ctk.CTkFrame(parent, fg_color=COLOR_CARD, corner_radius=6,
                                  cursor="hand2")
-        btn_frame.pack(fill="both", expand=True, padx=2, pady=1)
-        
+        btn_frame.pack(fill="x", padx=2, pady=1)
+        btn_frame.grid_columnconfigure(1, weight=1)
+
         # Bind click events
         def on_click(event=None):
             self.selected_path.set(folder.path)
-        
-        btn_frame.bind("<Button-1>", on_click)
-        
-        # Folder info
-        info_frame = ctk.CTkFrame(btn_frame, fg_color="transparent")
-        info_frame.pack(fill="both", expand=True, padx=8, pady=4)
-        info_frame.bind("<Button-1>", on_click)
-        
-        # Folder icon and name
-        name_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-        name_frame.pack(fill="x")
-        name_frame.bind("<Button-1>", on_click)
-        
-        icon_label = ctk.CTkLabel(name_frame, text="📁", font=("Segoe UI", 14))
-        icon_label.pack(side="left", padx=(0, 8))
-        icon_label.bind("<Button-1>", on_click)
-        
-        name_label = ctk.CTkLabel(name_frame, text=folder.name,
-                                  font=("Segoe UI Semibold", 12), text_color="#e4e4e8",
+
+        icon_label = ctk.CTkLabel(btn_frame, text="📁", font=FONT_ICON)
+        icon_label.grid(row=0, column=0, rowspan=2, padx=8)
+
+        name_label = ctk.CTkLabel(btn_frame, text=folder.name,
+                                  font=FONT_BODY_SEMIBOLD, text_color=COLOR_TEXT,
                                   anchor="w")
-        name_label.pack(side="left", fill="x", expand=True)
-        name_label.bind("<Button-1>", on_click)
-        
+        name_label.grid(row=0, column=1, sticky="ew", pady=(4, 0))
+
         # Time and size info
         time_ago = self._format_time_ago(folder.last_used)
         if folder.file_count > 0:
             size_text = self._format_size(folder.total_size)
             detail_text = f"{folder.file_count} files • {size_text} • {time_ago}"
+        elif folder.file_count < 0:
+            # Mount roots are sized from volume usage without a walk, so
+            # the file count is unknown
+            size_text = self._format_size(folder.total_size)
+            detail_text = f"— files • {size_text} • {time_ago}"
         else:
             detail_text = f"{time_ago}"
-        
-        detail_label = ctk.CTkLabel(info_frame, text=detail_text,
-                                    font=("Segoe UI", 10), text_color="#9090a0",
+
+        detail_label = ctk.CTkLabel(btn_frame, text=detail_text,
+                                    font=FONT_SMALL, text_color=COLOR_TEXT_SECONDARY,
                                     anchor="w")
-        detail_label.pack(fill="x", pady=(2, 0))
-        detail_label.bind("<Button-1>", on_click)
-        
-        # Path label (truncated)
-        path_text = self._truncate_path(folder.path, 60)
-        path_label = ctk.CTkLabel(info_frame, text=path_text,
-                                  font=("Consolas", 9), text_color="#6c6c80",
+        detail_label.grid(row=1, column=1, sticky="ew")
+
+        # Path label (truncated once at insertion time)
+        path_label = ctk.CTkLabel(btn_frame, text=folder._display_path,
+                                  font=FONT_MONO, text_color=COLOR_TEXT_DIM,
                                   anchor="w")
-        path_label.pack(fill="x")
-        path_label.bind("<Button-1>", on_click)
-        
+        path_label.grid(row=2, column=0, columnspan=2, sticky="ew",
+                        padx=8, pady=(0, 4))
+
         # Hover effects
         def on_enter(event):
-            btn_frame.configure(fg_color="#404050")
-        
+            btn_frame.configure(fg_color=COLOR_CARD_HOVER)
+
         def on_leave(event):
-            btn_frame.configure(fg_color="#35354a")
-        
-        for widget in [btn_frame, info_frame, name_frame, icon_label, name_label, 
-                       detail_label, path_label]:
-            widget.bind("<Enter>", on_enter)
-            widget.bind("<Leave>", on_leave)
+            # Crossing between children fires Leave too; only reset when
+            # the pointer has really left the row
+            under = btn_frame.winfo_containing(event.x_root, event.y_root)
+            while under is not None:
+                if under is btn_frame:
+                    return
+                under = under.master
+            btn_frame.configure(fg_color=COLOR_CARD)
+
+        # One shared bindtag per row instead of binding click/hover on each
+        # of the seven widgets: three class binds, and every subwidget
+        # (including the CTk-internal canvases) routes its events there
+        tag = f"folderrow{id(btn_frame)}"
+        btn_frame.bind_class(tag, "<Button-1>", on_click)
+        btn_frame.bind_class(tag, "<Enter>", on_enter)
+        btn_frame.bind_class(tag, "<Leave>", on_leave)
+
+        stack = [btn_frame]
+        while stack:
+            w = stack.pop()
+            w.bindtags((tag,) + w.bindtags())
+            stack.extend(w.winfo_children())
     
     def _browse_folder(self):
         """Open folder browser dialog."""
@@ -282,42 +462,92 @@ class ImprovedFolderSelector(ctk.CTkFrame):
     
     def _clear_history(self):
         """Clear folder history after confirmation."""
-        if messagebox.askyesno("Clear History", 
+        if messagebox.askyesno("Clear History",
                               "Are you sure you want to clear the folder history?"):
             config.clear_folder_history()
-            # Rebuild UI
-            for widget in self.winfo_children():
-                widget.destroy()
             self.recent_folders = []
-            self._build_ui()
+            # Only the recent list changed - drop that subtree and leave
+            # the path entry (and whatever the user typed) alone
+            if self._recent_frame is not None:
+                self._recent_frame.destroy()
+                self._recent_frame = None
     
     def _on_path_change(self, *args):
         """Handle path change to update info and call callback."""
         path = self.selected_path.get()
         if path and os.path.exists(path):
-            # Update info asynchronously
-            import threading
-            threading.Thread(target=self._update_folder_info, args=(path,), daemon=True).start()
-            
+            # Debounce the per-character trace callbacks so typing a path
+            # schedules one scan, not one thread per keystroke
+            if self._scan_debounce is not None:
+                self.after_cancel(self._scan_debounce)
+            self._scan_debounce = self.after(200, self._start_scan)
+
             if self.on_select_callback:
                 self.on_select_callback(path)
         else:
             self.info_label.configure(text="")
-    
-    def _update_folder_info(self, path: str):
+
+    def _start_scan(self):
+        """Launch a background scan of the currently selected path."""
+        self._scan_debounce = None
+        path = self.selected_path.get()
+        if not path or not os.path.exists(path):
+            return
+        # The generation counter lets a slow, stale scan's result be
+        # dropped instead of overwriting the label for a newer path
+        self._scan_gen += 1
+        import threading
+        threading.Thread(target=self._update_folder_info,
+                         args=(path, self._scan_gen), daemon=True).start()
+
+    def _update_folder_info(self, path: str, gen: Optional[int] = None):
         """Update folder information display."""
         try:
             folder_path = Path(path)
-            file_count = sum(1 for f in folder_path.rglob('*') if f.is_file())
-            total_size = sum(f.stat().st_size for f in folder_path.rglob('*') if f.is_file())
+
+            # Reuse the last scan while the root mtime is unchanged - a
+            # re-selected 10k-file share costs one stat instead of a walk
+            root_mtime = os.stat(path).st_mtime
+            cached = self._folder_stat_cache.get(path)
+            if cached is not None and cached[2] == root_mtime:
+                file_count, total_size = cached[0], cached[1]
+            else:
+                # One scandir walk: DirEntry caches type and stat from the
+                # directory read, so counting and sizing share one pass
+                # instead of two rglob traversals with a stat per file
+                file_count = 0
+                total_size = 0
+                stack = [path]
+                while stack:
+                    current = stack.pop()
+                    try:
+                        with os.scandir(current) as it:
+                            for entry in it:
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        stack.append(entry.path)
+                                    elif entry.is_file(follow_symlinks=False):
+                                        file_count += 1
+                                        total_size += entry.stat(follow_symlinks=False).st_size
+                                except OSError:
+                                    continue
+                    except OSError:
+                        continue
+                self._folder_stat_cache[path] = (file_count, total_size, root_mtime)
             size_text = self._format_size(total_size)
             
             info_text = f"📂 {folder_path.name} — {file_count} files — {size_text}"
-            
-            # Update UI in main thread
-            self.after(0, lambda: self.info_label.configure(text=info_text))
+
+            # Update UI in main thread, dropping results from superseded scans
+            def apply(text=info_text):
+                if gen is None or gen == self._scan_gen:
+                    self.info_label.configure(text=text)
+            self.after(0, apply)
         except Exception:
-            self.after(0, lambda: self.info_label.configure(text="📂 Ready to share"))
+            def apply_fallback():
+                if gen is None or gen == self._scan_gen:
+                    self.info_label.configure(text="📂 Ready to share")
+            self.after(0, apply_fallback)
     
     def _format_time_ago(self, timestamp: float) -> str:
         """Format timestamp as 'time ago' string."""
@@ -338,13 +568,7 @@ class ImprovedFolderSelector(ctk.CTkFrame):
     
     def _format_size(self, size_bytes: int) -> str:
         """Format file size in human readable format."""
-        if size_bytes == 0:
-            return "0 B"
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}" if unit != 'B' else f"{int(size_bytes)} B"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        return _format_size(int(size_bytes))
     
     def _truncate_path(self, path: str, max_length: int) -> str:
         """Truncate path to fit within max_length."""
@@ -366,13 +590,19 @@ class StatusProgressBar(ctk.CTkFrame):
     
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
+        self._last_ui_update = 0.0
+        # Pending widget writes, folded into one after_idle pass so a burst
+        # of set_status/set_progress calls costs one redraw, not one per call
+        self._pending = {}
+        self._applied = {}
+        self._flush_scheduled = False
         self._build_ui()
         self._reset()
     
     def _build_ui(self):
         # Status text
         self.status_label = ctk.CTkLabel(self, text="Ready", 
-                                         font=("Segoe UI", 12), text_color="#9090a0")
+                                         font=FONT_BODY, text_color=COLOR_TEXT_SECONDARY)
         self.status_label.pack(anchor="w", padx=8, pady=(8, 4))
         
         # Progress bar
@@ -385,45 +615,79 @@ class StatusProgressBar(ctk.CTkFrame):
         details_frame.pack(fill="x", padx=8, pady=(0, 8))
         
         self.detail_label = ctk.CTkLabel(details_frame, text="", 
-                                         font=("Segoe UI", 10), text_color="#6c6c80")
+                                         font=FONT_SMALL, text_color=COLOR_TEXT_DIM)
         self.detail_label.pack(side="left")
         
         self.percent_label = ctk.CTkLabel(details_frame, text="", 
-                                          font=("Segoe UI", 10), text_color="#0078d4")
+                                          font=FONT_SMALL, text_color=COLOR_ACCENT)
         self.percent_label.pack(side="right")
     
     def _reset(self):
         """Reset to default state."""
+        self._pending.clear()
+        self._applied.clear()
         self.status_label.configure(text="Ready")
         self.detail_label.configure(text="")
         self.percent_label.configure(text="")
         self.progress_bar.set(0)
-    
+
     def set_status(self, text: str, progress: float = None, details: str = ""):
         """Set status text and optional progress."""
-        self.status_label.configure(text=text)
-        self.detail_label.configure(text=details)
-        
+        self._pending['status'] = text
+        self._pending['detail'] = details
         if progress is not None:
-            self.progress_bar.set(progress)
-            self.percent_label.configure(text=f"{int(progress * 100)}%")
+            self._pending['progress'] = progress
+            self._pending['percent'] = f"{int(progress * 100)}%"
         else:
-            self.percent_label.configure(text="")
-    
+            self._pending['percent'] = ""
+        self._schedule_flush()
+
     def set_progress(self, current: int, total: int, item_name: str = ""):
         """Set progress with current/total values."""
+        # Throttle to ~60fps: per-file calls during a 10k-file transfer
+        # would otherwise redraw three canvases each, stalling the event
+        # loop. The final frame (current == total) always renders.
+        now = time.monotonic()
+        if now - self._last_ui_update < 0.016 and current != total:
+            return
+        self._last_ui_update = now
+
         if total == 0:
             progress = 0
         else:
             progress = current / total
-        
-        self.progress_bar.set(progress)
-        self.percent_label.configure(text=f"{int(progress * 100)}%")
-        
+
+        self._pending['progress'] = progress
+        self._pending['percent'] = f"{int(progress * 100)}%"
         if item_name:
-            self.detail_label.configure(text=f"Processing: {item_name}")
+            self._pending['detail'] = f"Processing: {item_name}"
         else:
-            self.detail_label.configure(text=f"{current} / {total}")
+            self._pending['detail'] = f"{current} / {total}"
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Queue one idle-time flush; later writes fold into the same pass."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush)
+
+    def _flush(self):
+        """Apply accumulated writes, touching only widgets whose value changed."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        applied = self._applied
+        for key, value in pending.items():
+            if applied.get(key) == value:
+                continue
+            applied[key] = value
+            if key == 'status':
+                self.status_label.configure(text=value)
+            elif key == 'detail':
+                self.detail_label.configure(text=value)
+            elif key == 'percent':
+                self.percent_label.configure(text=value)
+            elif key == 'progress':
+                self.progress_bar.set(value)
     
     def reset(self):
         """Reset to default state."""
@@ -1,3 +1,5 @@
+import threading
+
 import customtkinter as ctk
 from ui.sender_ui import SenderUI
 from ui.receiver_ui import ReceiverUI
@@ -93,10 +95,14 @@ class MainWindow:
         self.root = root
         self.root.title("LAN Share")
         
+        # Snapshot the settings the hot paths need - _on_configure fires per
+        # pixel of a resize drag and shouldn't chase attribute chains
+        self._auto_resize = config.settings.auto_resize
+        self._saved_width = config.settings.window_width
+        self._saved_height = config.settings.window_height
+
         # Use saved window size or defaults
-        width = config.settings.window_width
-        height = config.settings.window_height
-        self.root.geometry(f"{width}x{height}")
+        self.root.geometry(f"{self._saved_width}x{self._saved_height}")
         self.root.minsize(700, 500)  # More flexible minimum size
         self.root.configure(fg_color=COLORS["bg_dark"])
         
@@ -105,51 +111,88 @@ class MainWindow:
         
         # Track window resize for auto-saving
         self.root.bind("<Configure>", self._on_configure)
-        self._last_size_save = 0
-
+        self._resize_after_id = None
+        self._last_saved_size = (self._saved_width, self._saved_height)
+
+        # Constructed panels are kept and re-shown with pack; rebuilding
+        # SenderUI/ReceiverUI on every visit is the expensive part of
+        # switching (dozens of canvas-backed widgets each)
+        self._frames = {}
+        # history_version each cached frame last rendered; a mismatch on
+        # re-show means its history-backed widgets are stale
+        self._frame_history_seen = {}
         self.current_frame = None
         self.switch_frame("main")
 
     def switch_frame(self, frame_name):
         if self.current_frame:
-            self.current_frame.destroy()
+            self.current_frame.pack_forget()
             self.current_frame = None
 
-        if frame_name == "main":
-            # Don't force resize for main menu if auto-resize is enabled
-            if not config.settings.auto_resize:
-                self.root.geometry(f"{config.settings.window_width}x{config.settings.window_height}")
-            self.current_frame = MainMenu(self.root, self.switch_frame)
-        elif frame_name == "sender":
-            # Allow natural sizing for sender UI
-            if not config.settings.auto_resize:
+        # Don't force resize if auto-resize is enabled
+        if not self._auto_resize:
+            if frame_name == "main":
+                self.root.geometry(f"{self._saved_width}x{self._saved_height}")
+            elif frame_name == "sender":
                 self.root.geometry("820x650")
-            self.current_frame = SenderUI(self.root, self.switch_frame)
-            self.current_frame.pack(fill="both", expand=True)
-        elif frame_name == "receiver":
-            # Allow natural sizing for receiver UI
-            if not config.settings.auto_resize:
+            elif frame_name == "receiver":
                 self.root.geometry("920x720")
-            self.current_frame = ReceiverUI(self.root, self.switch_frame)
-            self.current_frame.pack(fill="both", expand=True)
-    
+
+        frame = self._frames.get(frame_name)
+        if frame is None:
+            if frame_name == "main":
+                frame = MainMenu(self.root, self.switch_frame)
+            elif frame_name == "sender":
+                frame = SenderUI(self.root, self.switch_frame)
+            elif frame_name == "receiver":
+                frame = ReceiverUI(self.root, self.switch_frame)
+            else:
+                return
+            self._frames[frame_name] = frame
+            self._frame_history_seen[frame_name] = config.history_version
+        elif self._frame_history_seen.get(frame_name) != config.history_version:
+            # Cached panels read history at build time; anything recorded
+            # while they were hidden (a new connection, a shared folder)
+            # has to be pushed into their widgets on re-show
+            refresh = getattr(frame, 'refresh_history', None)
+            if refresh is not None:
+                refresh()
+            self._frame_history_seen[frame_name] = config.history_version
+
+        frame.pack(fill="both", expand=True)
+        self.current_frame = frame
+
+    def refresh_settings(self):
+        """Re-sync snapshotted settings after a config change."""
+        self._auto_resize = config.settings.auto_resize
+        self._saved_width = config.settings.window_width
+        self._saved_height = config.settings.window_height
+
     def _on_configure(self, event):
         """Handle window resize events to save size."""
-        if event.widget == self.root and config.settings.auto_resize:
-            # Debounce resize events to avoid too frequent saves
-            import time
-            current_time = time.time()
-            if current_time - self._last_size_save > 0.5:
-                self._last_size_save = current_time
-                self.root.after(500, self._save_window_size)  # Delay to batch resize events
+        if event.widget is not self.root:
+            return
+        if self._auto_resize:
+            # Trailing-edge debounce: cancel and reschedule so exactly one
+            # save fires 500ms after the last resize event of a drag
+            if self._resize_after_id is not None:
+                self.root.after_cancel(self._resize_after_id)
+            self._resize_after_id = self.root.after(500, self._save_window_size)
     
     def _save_window_size(self):
         """Save current window size to config."""
+        self._resize_after_id = None
         try:
             width = self.root.winfo_width()
             height = self.root.winfo_height()
             if width > 100 and height > 100:  # Sanity check
-                config.update_window_size(width, height)
+                if (width, height) == self._last_saved_size:
+                    return
+                self._last_saved_size = (width, height)
+                self._saved_width, self._saved_height = width, height
+                # The JSON write has no business on the event loop
+                threading.Thread(target=config.update_window_size,
+                                 args=(width, height), daemon=True).start()
         except:
             pass
     
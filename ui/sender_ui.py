@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 import os
+import shutil
 import threading
 from pathlib import Path
 from network.server import HTTPServerManager
@@ -30,6 +31,53 @@ C = {
 }
 
 
+# Shared indexer pool: folder walks are metadata-bound, and a bounded pool
+# keeps rapid reselects from racing full-tree scans against each other
+_index_executor = None
+_index_executor_lock = threading.Lock()
+
+
+def _get_index_executor():
+    global _index_executor
+    if _index_executor is None:
+        with _index_executor_lock:
+            if _index_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _index_executor = ThreadPoolExecutor(
+                    max_workers=fs_optimizer.get_thread_count(),
+                    thread_name_prefix='folder-index')
+    return _index_executor
+
+
+def _walk_tree(root, cancel=None):
+    """Count files and bytes under root with an iterative scandir walk.
+
+    Returns (file_count, total_size); bails out early (with a partial
+    tally) when the cancel event is set.
+    """
+    file_count = 0
+    total_size = 0
+    stack = [root]
+    while stack:
+        if cancel is not None and cancel.is_set():
+            break
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            file_count += 1
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return file_count, total_size
+
+
 class SenderUI(ctk.CTkFrame):
     def __init__(self, master, switch_callback):
         super().__init__(master, fg_color=C["bg"], corner_radius=0)
@@ -38,6 +86,8 @@ class SenderUI(ctk.CTkFrame):
         self.is_running = False
         self.folder_path_var = ctk.StringVar()
         self.port_var = ctk.StringVar(value=config.settings.default_port)
+        self._index_future = None
+        self._index_cancel = None
         self._build()
 
     def _build(self):
@@ -150,21 +200,85 @@ class SenderUI(ctk.CTkFrame):
             width=180, height=40)
         self.start_btn.pack(side="left", padx=8, pady=12)
 
+    def refresh_history(self):
+        """Called by MainWindow when history changed while this panel was hidden."""
+        self.folder_selector.refresh_folders()
+
     def _on_folder_selected(self, folder_path):
         """Handle folder selection from enhanced selector."""
         self.folder_path_var.set(folder_path)
-        # Add to recent folders
-        threading.Thread(target=self._add_to_recent_folders, 
-                        args=(folder_path,), daemon=True).start()
-    
-    def _add_to_recent_folders(self, folder_path):
+        # Supersede any in-flight index of a previous selection: cancel it
+        # if still queued, and signal a running walk to bail out
+        if self._index_future is not None and not self._index_future.done():
+            self._index_future.cancel()
+        if self._index_cancel is not None:
+            self._index_cancel.set()
+        self._index_cancel = threading.Event()
+        self._index_future = _get_index_executor().submit(
+            self._add_to_recent_folders, folder_path, self._index_cancel)
+
+    def _add_to_recent_folders(self, folder_path, cancel=None):
         """Add folder to recent folders with file count and size."""
         try:
-            path = Path(folder_path)
-            file_count = sum(1 for f in path.rglob('*') if f.is_file())
-            total_size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+            # Sharing a whole mount (e.g. a drive root): the volume already
+            # tracks its used bytes, so skip the walk and record the count
+            # as unknown (-1, shown as an em dash in the folder list)
+            if os.path.ismount(folder_path):
+                usage = shutil.disk_usage(folder_path)
+                config.add_folder(folder_path, file_count=-1, total_size=usage.used)
+                return
+
+            # Re-selecting a recently indexed folder costs one stat: the
+            # walk result is cached against the root mtime
+            key = f"folder_index:{folder_path}:{os.stat(folder_path).st_mtime_ns}"
+            cached = global_cache.get(key)
+            if cached is not None:
+                config.add_folder(folder_path, cached[0], cached[1])
+                return
+
+            # One scandir pass over the root separates direct files from
+            # top-level subdirectories; each subtree then walks on its own
+            # worker so the disk can service several readdir streams at
+            # once. The is_dir/is_file branches answer from the readdir
+            # d_type where the platform provides it, so only regular files
+            # pay a stat (for st_size). The old double rglob paid ~3
+            # syscalls per entry and built a Path object for each.
+            file_count = 0
+            total_size = 0
+            subdirs = []
+            with os.scandir(folder_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            file_count += 1
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+
+            if len(subdirs) > 1:
+                # Dedicated short-lived pool: sub-walks must not queue on
+                # the shared indexer pool this method already runs on
+                from concurrent.futures import ThreadPoolExecutor, as_completed
+                workers = min(fs_optimizer.get_thread_count(), len(subdirs))
+                with ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix='folder-walk') as pool:
+                    futures = [pool.submit(_walk_tree, sub, cancel) for sub in subdirs]
+                    for future in as_completed(futures):
+                        count, size = future.result()
+                        file_count += count
+                        total_size += size
+            elif subdirs:
+                count, size = _walk_tree(subdirs[0], cancel)
+                file_count += count
+                total_size += size
+
+            if cancel is not None and cancel.is_set():
+                return
+            global_cache.set(key, (file_count, total_size), ttl=600)
             config.add_folder(folder_path, file_count, total_size)
-        except:
+        except Exception:
             config.add_folder(folder_path)
     
     def _show_settings(self):
@@ -3,13 +3,42 @@ Configuration management for LanShare application.
 Handles saving/loading user preferences, connection history, and app settings.
 """
 
+import atexit
 import json
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 import time
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Known-missing paths with a short TTL: re-probing an unplugged drive's
+# path (recent-folders refreshes do this repeatedly) costs a dict lookup
+# instead of a stat that has to time out on dead mounts
+_NEG_PATH_CACHE: Dict[str, float] = {}
+_NEG_PATH_TTL = 5.0
+
+
+def _path_exists(path: str) -> bool:
+    """os.path.lexists with a negative cache for recently missing paths."""
+    now = time.monotonic()
+    expires = _NEG_PATH_CACHE.get(path)
+    if expires is not None and expires > now:
+        return False
+    if os.path.lexists(path):
+        _NEG_PATH_CACHE.pop(path, None)
+        return True
+    _NEG_PATH_CACHE[path] = now + _NEG_PATH_TTL
+    return False
+
 
 @dataclass
 class ConnectionEntry:
@@ -84,10 +113,80 @@ class ConfigManager:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
         # Load or create default configuration
-        self.settings = self._load_settings()
-        self.recent_connections: List[ConnectionEntry] = self._load_connections()
-        self.recent_folders: List[FolderEntry] = self._load_folders()
+        # History lives in OrderedDicts keyed by identity ((ip, port) /
+        # path), most recent first: add/update/remove are O(1) lookups
+        # instead of linear scans over the list. All three files parse on
+        # a background thread so importing this module (which builds the
+        # global config) doesn't stall the UI thread on disk; accessors
+        # wait on _ready only if touched before the load finishes.
+        self._settings: Optional[AppSettings] = None
+        self._recent_connections: "Optional[OrderedDict[tuple, ConnectionEntry]]" = None
+        self._recent_folders: "Optional[OrderedDict[str, FolderEntry]]" = None
+        self._history_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._load_thread = threading.Thread(target=self._load_all, daemon=True)
+        self._load_thread.start()
+
+        # Version token bumped on every history mutation; lets getters hand
+        # out one memoized snapshot per version instead of a fresh copy per
+        # call (widgets re-query on every frame switch)
+        self.history_version = 0
+        self._connections_snapshot = (None, -1)
+        self._folders_snapshot = (None, -1)
+
+        # Debounced persistence: bursts of history mutations collapse into
+        # one atomic rewrite per file, flushed on exit if still pending
+        self._pending_saves = set()
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        atexit.register(self.flush_saves)
     
+    def _load_all(self) -> None:
+        """Parse all config files off the caller's thread."""
+        try:
+            settings = self._load_settings()
+            connections = self._load_connections()
+            folders = self._load_folders()
+            with self._history_lock:
+                if self._settings is None:
+                    self._settings = settings
+                if self._recent_connections is None:
+                    self._recent_connections = connections
+                if self._recent_folders is None:
+                    self._recent_folders = folders
+        finally:
+            self._ready.set()
+
+    @property
+    def settings(self) -> AppSettings:
+        """Application settings, waiting for the background load if needed."""
+        if self._settings is None:
+            self._ready.wait()
+            with self._history_lock:
+                if self._settings is None:
+                    self._settings = self._load_settings()
+        return self._settings
+
+    @property
+    def recent_connections(self) -> "OrderedDict[tuple, ConnectionEntry]":
+        """Connection history, waiting for the background load if needed."""
+        if self._recent_connections is None:
+            self._ready.wait()
+            with self._history_lock:
+                if self._recent_connections is None:
+                    self._recent_connections = self._load_connections()
+        return self._recent_connections
+
+    @property
+    def recent_folders(self) -> "OrderedDict[str, FolderEntry]":
+        """Folder history, waiting for the background load if needed."""
+        if self._recent_folders is None:
+            self._ready.wait()
+            with self._history_lock:
+                if self._recent_folders is None:
+                    self._recent_folders = self._load_folders()
+        return self._recent_folders
+
     def _get_config_dir(self) -> Path:
         """Get platform-specific configuration directory."""
         if os.name == 'nt':  # Windows
@@ -101,9 +200,8 @@ class ConfigManager:
         """Load settings from config file."""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return AppSettings(**data)
+                data = self._read_json(self.config_file)
+                return AppSettings(**data)
             except (json.JSONDecodeError, TypeError, ValueError):
                 pass
         
@@ -117,37 +215,89 @@ class ConfigManager:
         
         return settings
     
-    def _load_connections(self) -> List[ConnectionEntry]:
+    def _load_connections(self) -> "OrderedDict[tuple, ConnectionEntry]":
         """Load recent connections from file."""
-        if self.connections_file.exists():
-            try:
-                with open(self.connections_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    connections = [ConnectionEntry(**item) for item in data]
-                    # Sort by last used time (most recent first)
-                    return sorted(connections, key=lambda x: x.last_used, reverse=True)
-            except (json.JSONDecodeError, TypeError, ValueError):
-                pass
-        return []
-    
-    def _load_folders(self) -> List[FolderEntry]:
+        # Open directly and treat a missing file as empty history - one
+        # syscall fewer than a separate exists() stat before the read
+        try:
+            data = self._read_json(self.connections_file)
+            connections = [ConnectionEntry(**item) for item in data]
+            # Sort by last used time (most recent first)
+            connections.sort(key=lambda x: x.last_used, reverse=True)
+            return OrderedDict(((c.ip, c.port), c) for c in connections)
+        except (OSError, json.JSONDecodeError, TypeError, ValueError):
+            pass
+        return OrderedDict()
+
+    def _load_folders(self) -> "OrderedDict[str, FolderEntry]":
         """Load recent folders from file."""
-        if self.folders_file.exists():
-            try:
-                with open(self.folders_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    folders = [FolderEntry(**item) for item in data]
-                    # Sort by last used time (most recent first)
-                    return sorted(folders, key=lambda x: x.last_used, reverse=True)
-            except (json.JSONDecodeError, TypeError, ValueError):
-                pass
-        return []
+        try:
+            data = self._read_json(self.folders_file)
+            folders = [FolderEntry(**item) for item in data]
+            # Sort by last used time (most recent first)
+            folders.sort(key=lambda x: x.last_used, reverse=True)
+            return OrderedDict((f.path, f) for f in folders)
+        except (OSError, json.JSONDecodeError, TypeError, ValueError):
+            pass
+        return OrderedDict()
     
+    @staticmethod
+    def _read_json(path: Path) -> Any:
+        """Parse a JSON config file, using orjson's C parser when present."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if ORJSON_AVAILABLE:
+            return orjson.loads(raw)
+        return json.loads(raw)
+
+    @staticmethod
+    def _write_json(path: Path, data: Any) -> None:
+        """Write JSON via a temp file and rename, so a crash mid-write can
+        never leave a truncated config behind.
+
+        Serialization prefers orjson (C encoder, one bytes write) over
+        stdlib json.dump's per-token Python-level file writes.
+        """
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        tmp_path = str(path) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def _schedule_save(self, name: str) -> None:
+        """Queue a debounced write of one config file (~500ms later)."""
+        if name != 'settings':
+            self.history_version += 1
+        with self._save_lock:
+            self._pending_saves.add(name)
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(0.5, self.flush_saves)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush_saves(self) -> None:
+        """Write out any pending debounced saves immediately."""
+        with self._save_lock:
+            pending = self._pending_saves
+            self._pending_saves = set()
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        if 'settings' in pending:
+            self.save_settings()
+        if 'connections' in pending:
+            self.save_connections()
+        if 'folders' in pending:
+            self.save_folders()
+
     def save_settings(self) -> None:
         """Save current settings to file."""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(asdict(self.settings), f, indent=2, ensure_ascii=False)
+            self._write_json(self.config_file, asdict(self.settings))
         except (IOError, OSError) as e:
             print(f"Failed to save settings: {e}")
     
@@ -155,11 +305,9 @@ class ConfigManager:
         """Save recent connections to file."""
         try:
             # Limit to max recent connections
-            connections_to_save = self.recent_connections[:self.settings.max_recent_connections]
+            connections_to_save = list(self.recent_connections.values())[:self.settings.max_recent_connections]
             data = [asdict(conn) for conn in connections_to_save]
-            
-            with open(self.connections_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._write_json(self.connections_file, data)
         except (IOError, OSError) as e:
             print(f"Failed to save connections: {e}")
     
@@ -167,11 +315,9 @@ class ConfigManager:
         """Save recent folders to file."""
         try:
             # Limit to max recent folders
-            folders_to_save = self.recent_folders[:self.settings.max_recent_folders]
+            folders_to_save = list(self.recent_folders.values())[:self.settings.max_recent_folders]
             data = [asdict(folder) for folder in folders_to_save]
-            
-            with open(self.folders_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._write_json(self.folders_file, data)
         except (IOError, OSError) as e:
             print(f"Failed to save folders: {e}")
     
@@ -181,141 +327,143 @@ class ConfigManager:
             name = f"{ip}:{port}"
         
         current_time = time.time()
-        
-        # Check if connection already exists
-        for conn in self.recent_connections:
-            if conn.ip == ip and conn.port == port:
-                conn.last_used = current_time
-                conn.total_attempts += 1
-                if success:
-                    conn.success_count += 1
-                # Move to front
-                self.recent_connections.remove(conn)
-                self.recent_connections.insert(0, conn)
-                self.save_connections()
-                return
-        
-        # Add new connection
-        new_conn = ConnectionEntry(
-            ip=ip,
-            port=port,
-            name=name,
-            last_used=current_time,
-            success_count=1 if success else 0,
-            total_attempts=1
-        )
-        
-        self.recent_connections.insert(0, new_conn)
-        # Limit list size
-        if len(self.recent_connections) > self.settings.max_recent_connections:
-            self.recent_connections = self.recent_connections[:self.settings.max_recent_connections]
-        
-        self.save_connections()
+
+        key = (ip, port)
+        conn = self.recent_connections.pop(key, None)
+        if conn is not None:
+            conn.last_used = current_time
+            conn.total_attempts += 1
+            if success:
+                conn.success_count += 1
+        else:
+            conn = ConnectionEntry(
+                ip=ip,
+                port=port,
+                name=name,
+                last_used=current_time,
+                success_count=1 if success else 0,
+                total_attempts=1
+            )
+
+        # (Re-)insert at the front
+        self.recent_connections[key] = conn
+        self.recent_connections.move_to_end(key, last=False)
+        # Limit history size
+        while len(self.recent_connections) > self.settings.max_recent_connections:
+            self.recent_connections.popitem(last=True)
+
+        self._schedule_save('connections')
     
     def add_folder(self, path: str, file_count: int = 0, total_size: int = 0) -> None:
         """Add or update a folder in history."""
-        folder_path = Path(path)
-        if not folder_path.exists():
+        if not _path_exists(path):
             return
-        
-        name = folder_path.name
+
+        name = Path(path).name
         current_time = time.time()
-        
-        # Check if folder already exists
-        for folder in self.recent_folders:
-            if folder.path == path:
-                folder.last_used = current_time
-                folder.file_count = file_count
-                folder.total_size = total_size
-                # Move to front
-                self.recent_folders.remove(folder)
-                self.recent_folders.insert(0, folder)
-                self.save_folders()
-                return
-        
-        # Add new folder
-        new_folder = FolderEntry(
-            path=path,
-            name=name,
-            last_used=current_time,
-            file_count=file_count,
-            total_size=total_size
-        )
-        
-        self.recent_folders.insert(0, new_folder)
-        # Limit list size
-        if len(self.recent_folders) > self.settings.max_recent_folders:
-            self.recent_folders = self.recent_folders[:self.settings.max_recent_folders]
-        
-        self.save_folders()
+
+        folder = self.recent_folders.pop(path, None)
+        if folder is not None:
+            folder.last_used = current_time
+            folder.file_count = file_count
+            folder.total_size = total_size
+        else:
+            folder = FolderEntry(
+                path=path,
+                name=name,
+                last_used=current_time,
+                file_count=file_count,
+                total_size=total_size
+            )
+
+        # (Re-)insert at the front
+        self.recent_folders[path] = folder
+        self.recent_folders.move_to_end(path, last=False)
+        # Limit history size
+        while len(self.recent_folders) > self.settings.max_recent_folders:
+            self.recent_folders.popitem(last=True)
+
+        self._schedule_save('folders')
     
     def get_recent_connections(self, limit: Optional[int] = None) -> List[ConnectionEntry]:
         """Get recent connections, optionally limited."""
         if limit:
-            return self.recent_connections[:limit]
-        return self.recent_connections.copy()
-    
+            return list(self.recent_connections.values())[:limit]
+        snapshot, version = self._connections_snapshot
+        if snapshot is None or version != self.history_version:
+            snapshot = list(self.recent_connections.values())
+            self._connections_snapshot = (snapshot, self.history_version)
+        return snapshot
+
     def get_recent_folders(self, limit: Optional[int] = None) -> List[FolderEntry]:
         """Get recent folders, optionally limited."""
         if limit:
-            return self.recent_folders[:limit]
-        return self.recent_folders.copy()
+            return list(self.recent_folders.values())[:limit]
+        snapshot, version = self._folders_snapshot
+        if snapshot is None or version != self.history_version:
+            snapshot = list(self.recent_folders.values())
+            self._folders_snapshot = (snapshot, self.history_version)
+        return snapshot
     
     def clear_connection_history(self) -> None:
         """Clear all connection history."""
         self.recent_connections.clear()
-        self.save_connections()
+        self._schedule_save('connections')
     
     def clear_folder_history(self) -> None:
         """Clear all folder history."""
         self.recent_folders.clear()
-        self.save_folders()
+        self._schedule_save('folders')
     
     def remove_connection(self, ip: str, port: str) -> None:
         """Remove a specific connection from history."""
-        self.recent_connections = [
-            conn for conn in self.recent_connections 
-            if not (conn.ip == ip and conn.port == port)
-        ]
-        self.save_connections()
-    
+        self.recent_connections.pop((ip, port), None)
+        self._schedule_save('connections')
+
     def remove_folder(self, path: str) -> None:
         """Remove a specific folder from history."""
-        self.recent_folders = [
-            folder for folder in self.recent_folders 
-            if folder.path != path
-        ]
-        self.save_folders()
+        self.recent_folders.pop(path, None)
+        self._schedule_save('folders')
     
     def update_window_size(self, width: int, height: int) -> None:
         """Update saved window dimensions."""
         self.settings.window_width = width
         self.settings.window_height = height
-        self.save_settings()
+        self._schedule_save('settings')
     
     def get_default_download_path(self) -> str:
         """Get default download path, falling back to Downloads folder."""
-        if self.settings.default_download_path and os.path.exists(self.settings.default_download_path):
+        if self.settings.default_download_path and _path_exists(self.settings.default_download_path):
             return self.settings.default_download_path
-        
+
         # Fallback to Downloads folder
-        downloads_path = Path.home() / "Downloads"
-        if downloads_path.exists():
-            return str(downloads_path)
+        downloads_path = str(Path.home() / "Downloads")
+        if _path_exists(downloads_path):
+            return downloads_path
         
         # Final fallback to home directory
         return str(Path.home())
     
     def cleanup_invalid_entries(self) -> None:
         """Remove invalid folder entries (folders that no longer exist)."""
-        valid_folders = []
-        for folder in self.recent_folders:
-            if os.path.exists(folder.path):
-                valid_folders.append(folder)
-        
-        if len(valid_folders) != len(self.recent_folders):
-            self.recent_folders = valid_folders
-            self.save_folders()
+        # One direct stat per entry without symlink resolution; only a
+        # genuinely missing path drops the entry, and nothing is rewritten
+        # when the history is unchanged
+        invalid = []
+        for path in self.recent_folders:
+            try:
+                os.stat(path, follow_symlinks=False)
+            except FileNotFoundError:
+                invalid.append(path)
+                # Seed the negative cache so follow-up probes of the same
+                # dead path (add_folder, UI refresh) skip the stat
+                _NEG_PATH_CACHE[path] = time.monotonic() + _NEG_PATH_TTL
+            except OSError:
+                continue
+        if invalid:
+            for path in invalid:
+                del self.recent_folders[path]
+            self._schedule_save('folders')
 
 
 # Global config instance
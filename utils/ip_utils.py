@@ -1,8 +1,80 @@
 import socket
+import threading
+import time
+
+# Cached (ip, deadline): route resolution costs a socket/connect/close
+# triple per call, and callers re-query it on every status refresh
+_ip_cache = ('', 0.0)
+_ip_lock = threading.Lock()
+_IP_TTL = 30.0
+
 
 def get_local_ip():
     """
     Detects the local IP address of the machine on the LAN.
+    The result is cached for a short TTL; use invalidate_ip_cache() after
+    a network change to force a fresh lookup.
+    """
+    global _ip_cache
+    ip, deadline = _ip_cache
+    if ip and time.monotonic() < deadline:
+        return ip
+    with _ip_lock:
+        ip, deadline = _ip_cache
+        if ip and time.monotonic() < deadline:
+            return ip
+        ip = _detect_local_ip()
+        _ip_cache = (ip, time.monotonic() + _IP_TTL)
+        return ip
+
+
+def invalidate_ip_cache():
+    """Drop the cached address so the next call re-resolves it."""
+    global _ip_cache
+    _ip_cache = ('', 0.0)
+
+
+def _detect_local_ip():
+    """
+    Resolves the machine's LAN IP, preferring a pure in-kernel interface
+    query over the UDP-connect trick (which can stall on route/ARP
+    resolution on some systems).
+    """
+    ip = _detect_via_interfaces()
+    if ip:
+        return ip
+    return _detect_via_udp_connect()
+
+
+def _detect_via_interfaces():
+    """
+    Reads interface addresses straight from the kernel via psutil: the
+    first non-loopback, non-link-local IPv4 on an interface that is up.
+    Returns None when psutil is missing or no candidate is found.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        stats = psutil.net_if_stats()
+        for name, addrs in psutil.net_if_addrs().items():
+            st = stats.get(name)
+            if st is not None and not st.isup:
+                continue
+            for addr in addrs:
+                if addr.family != socket.AF_INET:
+                    continue
+                if addr.address.startswith(('127.', '169.254.')):
+                    continue
+                return addr.address
+    except Exception:
+        pass
+    return None
+
+
+def _detect_via_udp_connect():
+    """
     Tries to connect to an external server (Google DNS) to determine the
     interface used for internet traffic, which usually corresponds to the LAN IP.
     """
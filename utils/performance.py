@@ -5,77 +5,98 @@ Performance optimization utilities for LanShare.
 import os
 import threading
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Callable
-from functools import wraps
-import hashlib
+from functools import lru_cache, wraps
 
 
 class PerformanceCache:
-    """Thread-safe cache with TTL support for performance optimization."""
-    
-    def __init__(self, default_ttl: int = 300):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    """Thread-safe cache with TTL support for performance optimization.
+
+    Entries live in an OrderedDict as flat (value, expires_ns, hits)
+    tuples - roughly half the memory of the old dict-of-dicts layout -
+    kept in LRU order so size pressure evicts the coldest entries.
+    """
+
+    def __init__(self, default_ttl: int = 300, max_entries: int = 1024):
+        self._cache: "OrderedDict[Any, tuple]" = OrderedDict()
         self._lock = threading.RLock()
         self.default_ttl = default_ttl
-    
-    def get(self, key: str) -> Optional[Any]:
+        self.max_entries = max_entries
+
+    def get(self, key: Any) -> Optional[Any]:
         """Get value from cache if not expired."""
         with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if entry['expires'] > time.time():
-                    entry['hits'] += 1
-                    return entry['value']
-                else:
-                    del self._cache[key]
-        return None
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            value, expires, hits = entry
+            if expires < time.monotonic_ns():
+                del self._cache[key]
+                return None
+            self._cache[key] = (value, expires, hits + 1)
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[int] = None) -> None:
         """Set value in cache with TTL."""
         ttl = ttl or self.default_ttl
+        now = time.monotonic_ns()
         with self._lock:
-            self._cache[key] = {
-                'value': value,
-                'expires': time.time() + ttl,
-                'hits': 0,
-                'created': time.time()
-            }
-    
+            # Opportunistic sweep: drop expired entries sitting at the cold
+            # end so they don't linger until size pressure reaches them
+            while self._cache:
+                oldest_key = next(iter(self._cache))
+                if self._cache[oldest_key][1] >= now:
+                    break
+                del self._cache[oldest_key]
+            self._cache[key] = (value, now + ttl * 1_000_000_000, 0)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
     def clear(self) -> None:
         """Clear entire cache."""
         with self._lock:
             self._cache.clear()
-    
+
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self._lock:
-            total_hits = sum(entry['hits'] for entry in self._cache.values())
+            total_hits = sum(entry[2] for entry in self._cache.values())
             return {
                 'entries': len(self._cache),
                 'total_hits': total_hits,
-                'memory_usage': sum(len(str(entry['value'])) for entry in self._cache.values())
+                'memory_usage': sum(len(str(entry[0])) for entry in self._cache.values())
             }
 
 
-def cache_result(ttl: int = 300):
-    """Decorator to cache function results."""
+def cache_result(ttl: int = 300, maxsize: int = 256):
+    """Decorator to cache function results.
+
+    Backed by functools.lru_cache (a C wrapper - no per-call Python lock
+    or dict bookkeeping) with TTL expressed as a time bucket folded into
+    the key: a new bucket every `ttl` seconds makes old entries miss and
+    age out under LRU pressure.
+    """
     def decorator(func: Callable) -> Callable:
-        cache = PerformanceCache(ttl)
-        
+        ttl_ns = ttl * 1_000_000_000
+
+        @lru_cache(maxsize=maxsize)
+        def _cached(bucket, args, kwargs_items):
+            return func(*args, **dict(kwargs_items))
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Create cache key from function args
-            key = hashlib.md5(str((args, kwargs)).encode()).hexdigest()
-            
-            result = cache.get(key)
-            if result is not None:
-                return result
-            
-            result = func(*args, **kwargs)
-            cache.set(key, result, ttl)
-            return result
-        
-        wrapper.cache = cache
+            bucket = time.monotonic_ns() // ttl_ns
+            try:
+                return _cached(bucket, args, tuple(sorted(kwargs.items())))
+            except TypeError:
+                # Unhashable arguments can't be memoized - call through
+                return func(*args, **kwargs)
+
+        # Expose the underlying lru_cache wrapper (cache_clear/cache_info)
+        wrapper.cache = _cached
         return wrapper
     return decorator
 
@@ -167,18 +188,25 @@ class MemoryOptimizer:
     @staticmethod
     def cleanup_temp_files(temp_dir: str, max_age_hours: int = 1) -> None:
         """Clean up temporary files older than specified age."""
-        import glob
         current_time = time.time()
         max_age_seconds = max_age_hours * 3600
-        
-        for temp_file in glob.glob(os.path.join(temp_dir, "*")):
-            try:
-                if os.path.isfile(temp_file):
-                    file_age = current_time - os.path.getctime(temp_file)
-                    if file_age > max_age_seconds:
-                        os.remove(temp_file)
-            except (OSError, IOError):
-                continue
+
+        # scandir streams entries and serves type and ctime from one stat,
+        # where glob materialized the listing and then paid isfile +
+        # getctime stats per entry
+        try:
+            with os.scandir(temp_dir) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        age = current_time - entry.stat(follow_symlinks=False).st_ctime
+                        if age > max_age_seconds:
+                            os.remove(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
 
 
 # Global instances